@@ -0,0 +1,90 @@
+"""Dispatch cost of an if/elif command chain versus the CommandRegistry trie.
+
+Registers 200 synthetic commands of one to three words (half of them
+taking arguments) and times resolving command lines that hit the first,
+middle and last registered command, plus an unknown one. The chain is
+modelled as the old execute_command did it: one command.lower() and one
+comparison per branch. Run from the project root:
+
+    python benchmarks/bench_command_dispatch.py [commands]
+"""
+import os
+import sys
+import time
+import random
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from src.commands.command_registry import CommandRegistry
+
+WORDS = ['list', 'show', 'open', 'close', 'build', 'cache', 'system', 'program', 'file', 'job',
+         'pool', 'profile', 'logs', 'top', 'history', 'stats', 'clear', 'run', 'stop', 'status']
+
+
+def synthetic_commands(count, seed=1):
+    """[(name, takes_args)] with distinct names"""
+    rng = random.Random(seed)
+    commands = {}
+    while len(commands) < count:
+        name = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+        commands.setdefault(name, rng.random() < 0.5)
+    return list(commands.items())
+
+
+def chain_dispatch(chain, command):
+    """The if/elif chain: every branch lowercases the line again and compares"""
+    for name, takes_args in chain:
+        if takes_args:
+            if command.lower().startswith(name + ' ') or command.lower() == name:
+                return name
+        elif command.lower() == name:
+            return name
+    return None
+
+
+def time_calls(call, lines, repeat=5, loops=2000):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            for line in lines:
+                call(line)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / (loops * len(lines)) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    commands = synthetic_commands(count)
+    # Prefix-matched commands must come before shorter ones in a chain, as they did in the old one
+    chain = sorted(commands, key=lambda command: -len(command[0]))
+    registry = CommandRegistry()
+    for name, takes_args in commands:
+        registry.register(name, lambda args: args, takes_args=takes_args)
+
+    def line_for(name, takes_args):
+        return name.upper() + (' Some Argument' if takes_args else '')
+
+    cases = {
+        'first branch': [line_for(*chain[0])],
+        'middle branch': [line_for(*chain[len(chain) // 2])],
+        'last branch': [line_for(*chain[-1])],
+        'unknown': ['frobnicate the widgets'],
+    }
+    for lines in cases.values():
+        for line in lines:
+            assert chain_dispatch(chain, line) == (registry.resolve(line)[0].name if registry.resolve(line)[0] else None)
+
+    print(f"{count} registered commands")
+    print(f"{'case':16}{'if/elif chain':>16}{'registry trie':>16}")
+    for case, lines in cases.items():
+        chained = time_calls(lambda line: chain_dispatch(chain, line), lines)
+        trie = time_calls(registry.resolve, lines)
+        print(f"{case:16}{chained:13.2f} us{trie:13.2f} us")
+
+
+if __name__ == '__main__':
+    main()
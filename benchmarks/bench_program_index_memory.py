@@ -0,0 +1,115 @@
+"""Memory per program entry of the old dict-based index versus the compact ProgramIndex.
+
+Builds a synthetic 50k-entry PATH (60 directories of empty executables
+with realistic name lengths) in a temporary directory and measures, with
+tracemalloc, the memory each representation keeps alive. Both sides count
+everything the index holds: the snapshot and the cached per-directory
+listings. Run from the project root:
+
+    python benchmarks/bench_program_index_memory.py [entries]
+"""
+import gc
+import os
+import sys
+import time
+import random
+import tempfile
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from src.commands.program_index import ProgramIndex
+from src.commands.program_matcher import fuzzy_matches
+
+DIRECTORIES = 60
+WORDS = ['git', 'python', 'gnome', 'kde', 'x11', 'perl', 'lib', 'config', 'tool', 'server',
+         'client', 'update', 'helper', 'daemon', 'qt6', 'gtk', 'ssh', 'net', 'fs', 'print']
+
+
+def synthetic_path(root, count, seed=1):
+    """Create count executables spread over DIRECTORIES directories under root, like a large PATH"""
+    rng = random.Random(seed)
+    directories = [os.path.join(root, f"vendor{i}", 'bin') for i in range(DIRECTORIES)]
+    for directory in directories:
+        os.makedirs(directory)
+    names = set()
+    while len(names) < count:
+        name = '-'.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))) + str(rng.randint(0, 999))
+        if name in names:
+            continue
+        names.add(name)
+        # Most programs live in a few big directories, as on a real system
+        path = os.path.join(directories[min(int(rng.expovariate(0.5)), DIRECTORIES - 1)], name)
+        with open(path, 'w'):
+            pass
+        os.chmod(path, 0o755)
+    return directories
+
+
+def old_index(directories):
+    """What the index held before: per-directory name lists, a name -> path dict, a sorted list and a blob"""
+    listings = {directory: {'mtime': os.stat(directory).st_mtime_ns, 'names': os.listdir(directory)}
+                for directory in directories}
+    programs = {}
+    for directory, listing in listings.items():
+        for name in listing['names']:
+            programs.setdefault(name.lower(), os.path.join(directory, name))
+    names = sorted(programs)
+    return listings, programs, names, '\n'.join(names)
+
+
+def new_index(directories, cache_file):
+    index = ProgramIndex(cache_file)
+    index.scan(directories)
+    return index
+
+
+def measure(build, *args):
+    """Bytes kept alive by build()'s result, including the strings it owns"""
+    gc.collect()
+    tracemalloc.start()
+    result = build(*args)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained
+
+
+def time_lookups(lookup, names, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for name in names:
+            lookup(name)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(names) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory(prefix='cli-bot-bench-') as root:
+        directories = synthetic_path(root, count)
+        (_, programs, names, blob), old_bytes = measure(old_index, directories)
+        index, new_bytes = measure(new_index, directories, os.path.join(root, 'programs.json'))
+    name_array = index.snapshot.names
+    table = index.snapshot.programs
+
+    print(f"{count} programs in {DIRECTORIES} directories (snapshot and cached listings)")
+    print(f"lists + dict + blob         {old_bytes / 1024 / 1024:7.2f} MB   {old_bytes / count:6.1f} bytes/entry")
+    print(f"ProgramIndex                {new_bytes / 1024 / 1024:7.2f} MB   {new_bytes / count:6.1f} bytes/entry")
+    print(f"reduction                   {old_bytes / new_bytes:.1f}x")
+
+    sample = random.Random(2).sample(names, 2000)
+    print(f"lookup (dict)               {time_lookups(programs.get, sample):6.2f} us")
+    print(f"lookup (ProgramTable)       {time_lookups(table.get, sample):6.2f} us")
+    queries = ['pyth', 'gnome-conf', 'sshd', 'kdeupdat', 'zz']
+    print(f"fuzzy match (list)          {time_lookups(lambda q: fuzzy_matches(names, blob, q), queries) / 1000:6.2f} ms")
+    print(f"fuzzy match (NameArray)     "
+          f"{time_lookups(lambda q: fuzzy_matches(name_array, name_array.blob, q), queries) / 1000:6.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
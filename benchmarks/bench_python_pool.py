@@ -0,0 +1,68 @@
+"""Compare running a workspace script in a fresh interpreter with the warm Python pool.
+
+Run from the project root: python benchmarks/bench_python_pool.py [runs]
+"""
+import os
+import sys
+import time
+import tempfile
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from src.commands.python_pool import PythonPool
+
+SCRIPT = """\
+import json, re, datetime, pathlib
+print(json.dumps({'now': str(datetime.datetime.now()), 'ok': bool(re.match('a', 'a'))}))
+"""
+
+
+def cold_run(script):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, script], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=True)
+    return time.perf_counter() - start
+
+
+def warm_run(pool, script):
+    start = time.perf_counter()
+    process, output = pool.run(script)
+    output.read()
+    process.wait()
+    elapsed = time.perf_counter() - start
+    output.close()
+    return elapsed
+
+
+def report(label, samples):
+    ms = sorted(sample * 1000 for sample in samples)
+    print(f"{label:<12} median {statistics.median(ms):7.2f} ms   "
+          f"p90 {ms[int(len(ms) * 0.9) - 1]:7.2f} ms   min {ms[0]:7.2f} ms")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    with tempfile.TemporaryDirectory() as tmp:
+        script = os.path.join(tmp, 'bench_script.py')
+        with open(script, 'w') as f:
+            f.write(SCRIPT)
+
+        cold = [cold_run(script) for _ in range(runs)]
+
+        pool = PythonPool(notify=print)
+        warm = []
+        for _ in range(runs):
+            warm.append(warm_run(pool, script))
+        pool.shutdown()
+
+    print(f"{runs} runs of a script importing json, re, datetime and pathlib")
+    report("cold spawn", cold)
+    report("warm pool", warm)
+    print(f"speedup      {statistics.median(cold) / statistics.median(warm):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
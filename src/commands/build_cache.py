@@ -0,0 +1,178 @@
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+from threading import Lock
+
+# Get the project root directory
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Add the root directory to Python path
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from src.config import CACHE_DIR
+from src.utils.display import format_bytes
+
+BUILD_CACHE_DIR = os.path.join(CACHE_DIR, 'builds')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+INDEX_VERSION = 1
+
+# Quoted includes are resolved next to the source, so edits to local headers invalidate the build
+LOCAL_INCLUDE = re.compile(rb'^\s*#\s*include\s*"([^"]+)"', re.MULTILINE)
+
+
+class BuildCache:
+    """Content-addressed cache of compiled workspace artifacts.
+
+    Each artifact directory is keyed by a hash of the source (plus local
+    headers), the compiler binary and the compiler flags. Artifacts are
+    evicted least-recently-used once the cache grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir=BUILD_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = Lock()
+        self._entries = self._load_index()
+
+    def key(self, source_path, compiler, flags):
+        """Hash of everything that determines the build output"""
+        digest = hashlib.sha256()
+        self._hash_source(digest, os.path.abspath(source_path), set())
+
+        compiler_path = shutil.which(compiler) or compiler
+        digest.update(compiler_path.encode())
+        try:
+            st = os.stat(compiler_path)
+            digest.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+        except OSError:
+            pass
+
+        digest.update('\0'.join(flags).encode())
+        return digest.hexdigest()
+
+    def lookup(self, key):
+        """Directory holding the cached artifact for key, or None on a miss"""
+        artifact_dir = os.path.join(self.cache_dir, key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not os.path.isdir(artifact_dir):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            entry['last_used'] = time.time()
+            self.hits += 1
+            self._save_index()
+        return artifact_dir
+
+    def begin(self, key):
+        """Fresh private directory for building the artifact for key"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return tempfile.mkdtemp(prefix=key[:16] + '.', suffix='.tmp', dir=self.cache_dir)
+
+    def store(self, key, build_dir, source_path):
+        """Move a finished build into the cache and evict old artifacts"""
+        artifact_dir = os.path.join(self.cache_dir, key)
+        with self._lock:
+            if os.path.isdir(artifact_dir):
+                # Another build of the same inputs finished first
+                shutil.rmtree(build_dir, ignore_errors=True)
+            else:
+                os.replace(build_dir, artifact_dir)
+            self._entries[key] = {
+                'source': os.path.basename(source_path),
+                'size': _directory_size(artifact_dir),
+                'last_used': time.time(),
+            }
+            self._evict(keep=key)
+            self._save_index()
+        return artifact_dir
+
+    def discard(self, build_dir):
+        """Remove a build directory whose compile failed"""
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+    def clear(self):
+        """Remove every cached artifact"""
+        with self._lock:
+            for key in list(self._entries):
+                shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+            self._entries = {}
+            self._save_index()
+
+    def stats(self):
+        """Summary of cache size and hit rate"""
+        with self._lock:
+            total = sum(entry['size'] for entry in self._entries.values())
+            count = len(self._entries)
+        lookups = self.hits + self.misses
+        hit_rate = f"{self.hits / lookups * 100:.0f}%" if lookups else "n/a"
+        return (f"Build cache: {count} artifacts, {format_bytes(total)} of {format_bytes(self.max_bytes)}\n"
+                f"Location: {self.cache_dir}\n"
+                f"Hits: {self.hits} | Misses: {self.misses} | Hit rate: {hit_rate} | Evictions: {self.evictions}")
+
+    def _hash_source(self, digest, path, seen):
+        """Hash a source file and, recursively, the local headers it includes"""
+        if path in seen:
+            return
+        seen.add(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest.update(path.encode() + b'\0' + data)
+
+        for include in LOCAL_INCLUDE.findall(data):
+            header = os.path.join(os.path.dirname(path), os.fsdecode(include))
+            if os.path.isfile(header):
+                self._hash_source(digest, os.path.abspath(header), seen)
+
+    def _evict(self, keep=None):
+        """Drop least recently used artifacts until the cache fits in max_bytes"""
+        total = sum(entry['size'] for entry in self._entries.values())
+        for key in sorted(self._entries, key=lambda k: self._entries[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._entries.pop(key)['size']
+            shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+            self.evictions += 1
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.cache_dir, 'index.json'), 'r') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                return data['entries']
+        except Exception:
+            pass
+        return {}
+
+    def _save_index(self):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            index_file = os.path.join(self.cache_dir, 'index.json')
+            with open(index_file + '.tmp', 'w') as f:
+                json.dump({'version': INDEX_VERSION, 'entries': self._entries}, f)
+            os.replace(index_file + '.tmp', index_file)
+        except Exception:
+            pass
+
+
+def _directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
@@ -0,0 +1,128 @@
+import re
+import html
+from importlib import metadata
+
+# Entry point group third-party packages use to add commands
+PLUGIN_GROUP = 'cli_ai.commands'
+
+# Where a command's handler runs: a worker thread, the GUI thread on the
+# next event loop pass, or the GUI thread at once, before the command is queued
+WORKER = 'worker'
+GUI = 'gui'
+IMMEDIATE = 'immediate'
+
+# One command word; matched in C so the argument text keeps its original spacing
+_WORD = re.compile(r'\S+')
+
+
+class Command:
+    """One registered command: its words, handler and help entry"""
+
+    __slots__ = ('name', 'handler', 'usage', 'help', 'section', 'takes_args', 'run_on', 'entry_point')
+
+    def __init__(self, name, handler, usage='', help='', section='Other', takes_args=False,
+                 run_on=WORKER, entry_point=None):
+        self.name = name
+        self.handler = handler
+        self.usage = usage
+        self.help = help
+        self.section = section
+        self.takes_args = takes_args
+        self.run_on = run_on
+        self.entry_point = entry_point
+
+    def load(self, context):
+        """Import a plugin's handler on first use; plugins are called as handler(args, context)"""
+        if self.handler is None:
+            plugin = self.entry_point.load()
+            self.handler = lambda args: plugin(args, context)
+            if not self.help and plugin.__doc__:
+                self.help = plugin.__doc__.strip().splitlines()[0]
+        return self.handler
+
+
+class CommandRegistry:
+    """Commands stored in a trie keyed by lowercased words.
+
+    resolve() walks the typed words once, taking the longest registered
+    command that matches, and hands the rest of the line to the handler
+    with its original case and spacing. Dispatch cost depends on the
+    number of words typed, not on how many commands exist. Help text is
+    generated from the same registrations, so it cannot drift from them.
+    """
+
+    def __init__(self, context=None):
+        self.context = context
+        self.commands = []
+        # word -> child node; the None key holds the command ending at this node
+        self._root = {}
+
+    def register(self, name, handler, usage='', help='', section='Other', takes_args=False, run_on=WORKER,
+                 entry_point=None):
+        """Add a command; handler(args) returns the response text (or None if it showed its own output)"""
+        command = Command(name, handler, usage, help, section, takes_args, run_on, entry_point)
+        node = self._root
+        for word in name.lower().split():
+            node = node.setdefault(word, {})
+        if None in node:
+            self.commands.remove(node[None])
+        node[None] = command
+        self.commands.append(command)
+        return command
+
+    def describe(self, name, usage='', help='', section='Other'):
+        """Add a help entry for a form of an existing command that the trie cannot key on (e.g. 'open @name')"""
+        self.commands.append(Command(name, None, usage, help, section))
+
+    def load_plugins(self, group=PLUGIN_GROUP):
+        """Register every installed plugin command without importing it; returns how many were found"""
+        try:
+            entry_points = metadata.entry_points(group=group)
+        except TypeError:
+            # Python < 3.10
+            entry_points = metadata.entry_points().get(group, [])
+        count = 0
+        for entry_point in entry_points:
+            distribution = getattr(entry_point, 'dist', None)
+            source = f" (from {distribution.name})" if distribution is not None else ""
+            self.register(entry_point.name.replace('_', ' '), None, usage='[args]', help=f"Plugin command{source}",
+                          section='Plugins', takes_args=True, entry_point=entry_point)
+            count += 1
+        return count
+
+    def resolve(self, text):
+        """(command, argument text) for a command line, or (None, text) if nothing matches"""
+        node = self._root
+        # (command, end of its words) for every command along the path, shortest first
+        matches = []
+        for word in _WORD.finditer(text):
+            node = node.get(word.group().lower())
+            if node is None:
+                break
+            command = node.get(None)
+            if command is not None:
+                matches.append((command, word.end()))
+        # Longest match first, falling back to a shorter one that accepts the extra words
+        for command, end in reversed(matches):
+            args = text[end:].strip()
+            if not args or command.takes_args:
+                return command, args
+        return None, text
+
+    def help_html(self):
+        """Help text for every command with a help entry, grouped by section in registration order"""
+        sections = {}
+        for command in self.commands:
+            if command.help is not None:
+                sections.setdefault(command.section, []).append(command)
+
+        blocks = []
+        for section, commands in sections.items():
+            entries = []
+            for command in commands:
+                usage = f" {html.escape(command.usage)}" if command.usage else ""
+                lines = [f'    <span style="color: #00ff00;">{html.escape(command.name)}</span>{usage}']
+                lines += [f"        {html.escape(line)}" for line in command.help.splitlines()]
+                entries.append("\n".join(lines))
+            blocks.append(f"<b>{section}</b>\n" + "\n    \n".join(entries))
+        return "Available Commands:\n\n" + "\n\n".join(blocks)
@@ -0,0 +1,176 @@
+import os
+import sys
+import json
+import shlex
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+# Get the project root directory
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Add the root directory to Python path
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from src.config import CACHE_DIR
+
+DESKTOP_CACHE_FILE = os.path.join(CACHE_DIR, 'desktop_entries.json')
+CACHE_VERSION = 1
+MAX_PARSE_WORKERS = 8
+
+# Exec field codes (see the Desktop Entry spec); they stand for files/URLs we never pass
+FIELD_CODES = {'%f', '%F', '%u', '%U', '%d', '%D', '%n', '%N', '%i', '%c', '%k', '%v', '%m'}
+
+
+def application_dirs():
+    """XDG application directories in precedence order"""
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    data_dirs = os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share'
+    dirs = [data_home] + [d for d in data_dirs.split(':') if d]
+    seen = []
+    for directory in dirs:
+        path = os.path.join(directory, 'applications')
+        if path not in seen:
+            seen.append(path)
+    return seen
+
+
+class DesktopEntryIndex:
+    """Applications described by .desktop files, with a per-file parse cache.
+
+    Each file's parsed metadata is cached together with its mtime, so a
+    startup only re-parses files that changed. Stale files are parsed on a
+    thread pool.
+    """
+
+    def __init__(self, cache_file=DESKTOP_CACHE_FILE):
+        self.cache_file = cache_file
+        self._lock = Lock()
+        self._files = self._load_cache()
+
+    def scan(self, directories=None, force=False):
+        """Return {lowercase name: argv} for every launchable application.
+
+        Names come from Name, then Keywords, then the Exec program name;
+        earlier applications (and earlier kinds of name) win collisions.
+        """
+        desktop_files = self._desktop_files(directories or application_dirs())
+
+        stale = []
+        files = {}
+        for path, mtime in desktop_files:
+            cached = self._files.get(path)
+            if not force and cached and cached['mtime'] == mtime:
+                files[path] = cached
+            else:
+                stale.append((path, mtime))
+
+        if stale:
+            workers = max(1, min(MAX_PARSE_WORKERS, len(stale)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for (path, mtime), entry in zip(stale, executor.map(lambda item: parse_desktop_file(item[0]), stale)):
+                    files[path] = {'mtime': mtime, 'entry': entry}
+
+        with self._lock:
+            changed = bool(stale) or files.keys() != self._files.keys()
+            self._files = files
+            if changed:
+                self._save_cache()
+
+        entries = [files[path]['entry'] for path, _ in desktop_files if files[path]['entry']]
+        applications = {}
+        for field in ('name', 'keywords', 'program'):
+            for entry in entries:
+                values = entry[field] if field == 'keywords' else [entry[field]]
+                for value in values:
+                    if value:
+                        applications.setdefault(value.lower(), entry['exec'])
+        return applications
+
+    def _desktop_files(self, directories):
+        """(path, mtime) of each .desktop file, keeping only the first file per desktop id"""
+        found = []
+        seen_ids = set()
+        for directory in directories:
+            for root, _, names in os.walk(directory):
+                for name in sorted(names):
+                    if not name.endswith('.desktop'):
+                        continue
+                    path = os.path.join(root, name)
+                    # Files in subdirectories get ids like 'kde4-foo.desktop'
+                    desktop_id = os.path.relpath(path, directory).replace(os.sep, '-')
+                    if desktop_id in seen_ids:
+                        continue
+                    seen_ids.add(desktop_id)
+                    try:
+                        found.append((path, os.stat(path).st_mtime_ns))
+                    except OSError:
+                        continue
+        return found
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                return data['files']
+        except Exception:
+            pass
+        return {}
+
+    def _save_cache(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            temp_file = self.cache_file + '.tmp'
+            with open(temp_file, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'files': self._files}, f)
+            os.replace(temp_file, self.cache_file)
+        except Exception:
+            pass
+
+
+def parse_desktop_file(path):
+    """Launch metadata of a .desktop file, or None if it is not a visible application"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    fields = {}
+    in_entry = False
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('['):
+            in_entry = line == '[Desktop Entry]'
+            continue
+        if in_entry and '=' in line:
+            key, value = line.split('=', 1)
+            # Localized keys (Name[de]) stay under their own key; only untranslated ones are read
+            fields.setdefault(key.strip(), value.strip())
+
+    if fields.get('Type') != 'Application' or 'Exec' not in fields:
+        return None
+    if fields.get('Hidden') == 'true' or fields.get('NoDisplay') == 'true':
+        return None
+
+    argv = exec_arguments(fields['Exec'])
+    if not argv:
+        return None
+    return {
+        'name': fields.get('Name', ''),
+        'keywords': [keyword for keyword in fields.get('Keywords', '').split(';') if keyword],
+        'program': os.path.basename(argv[0]),
+        'exec': argv,
+    }
+
+
+def exec_arguments(exec_line):
+    """Split an Exec value into argv, dropping field codes"""
+    try:
+        args = shlex.split(exec_line)
+    except ValueError:
+        return []
+    return [arg.replace('%%', '%') for arg in args if arg not in FIELD_CODES]
@@ -0,0 +1,68 @@
+import os
+import time
+import signal
+import subprocess
+
+# posix_spawn is implemented with vfork-style clone on glibc and natively on macOS
+AVAILABLE = hasattr(os, 'posix_spawn')
+
+
+class SpawnedProcess:
+    """Popen-like handle for a program started with os.posix_spawn"""
+
+    def __init__(self, pid, args, stdout):
+        self.pid = pid
+        self.args = args
+        self.stdout = stdout
+        self.returncode = None
+
+    def poll(self):
+        if self.returncode is None:
+            try:
+                pid, status = os.waitpid(self.pid, os.WNOHANG)
+                if pid:
+                    self.returncode = os.waitstatus_to_exitcode(status)
+            except ChildProcessError:
+                # Reaped by the process supervisor, which sets returncode
+                pass
+        return self.returncode
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            time.sleep(0.01)
+        return self.returncode
+
+    def send_signal(self, sig):
+        if self.returncode is None:
+            os.kill(self.pid, sig)
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+
+def spawn(executable, args):
+    """Start executable with args in a new session, stdin from /dev/null and output on a pipe.
+
+    No shell and no Python-level fork: the child execs straight away, so
+    the returned pid is the program itself.
+    """
+    output_read, output_write = os.pipe()
+    file_actions = [
+        (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+        (os.POSIX_SPAWN_DUP2, output_write, 1),
+        (os.POSIX_SPAWN_DUP2, output_write, 2),
+    ]
+    try:
+        pid = os.posix_spawn(executable, list(args), os.environ, file_actions=file_actions, setsid=True)
+    except BaseException:
+        os.close(output_read)
+        raise
+    finally:
+        os.close(output_write)
+    return SpawnedProcess(pid, list(args), os.fdopen(output_read, 'rb'))
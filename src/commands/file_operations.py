@@ -15,6 +15,8 @@ class FileOperations:
         # Create workspace directory if it doesn't exist
         if not os.path.exists(WORKSPACE_DIR):
             os.makedirs(WORKSPACE_DIR)
+        self._workspace_mtime = None
+        self._workspace_files = []
 
     def create_file(self, filename, content=''):
         """Create a file in the workspace directory with specified content"""
@@ -48,6 +50,18 @@ class FileOperations:
         except Exception as e:
             return f"Error listing files: {str(e)}"
 
+    def workspace_files(self):
+        """Sorted workspace file names, re-listed only when the directory changes"""
+        try:
+            mtime = os.stat(WORKSPACE_DIR).st_mtime_ns
+            if mtime != self._workspace_mtime:
+                self._workspace_files = sorted(os.listdir(WORKSPACE_DIR))
+                self._workspace_mtime = mtime
+        except OSError:
+            self._workspace_files = []
+            self._workspace_mtime = None
+        return self._workspace_files
+
     def _format_size(self, size):
         """Format file size to human readable format"""
         for unit in ['B', 'KB', 'MB', 'GB']:
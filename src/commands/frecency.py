@@ -0,0 +1,87 @@
+import os
+import sys
+import json
+import time
+from threading import Lock
+
+# Get the project root directory
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Add the root directory to Python path
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from src.config import CACHE_DIR
+
+FRECENCY_FILE = os.path.join(CACHE_DIR, 'frecency.json')
+STORE_VERSION = 1
+# A launch counts half as much after this many seconds
+HALF_LIFE = 7 * 24 * 3600
+MAX_ENTRIES = 500
+
+
+class FrecencyStore:
+    """Launch counts that decay with age, persisted per program name.
+
+    Each entry keeps its score as of its last launch, so a launch is one
+    multiplication and an increment; scores are decayed to the present
+    only when they are compared.
+    """
+
+    def __init__(self, path=FRECENCY_FILE, half_life=HALF_LIFE, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.half_life = half_life
+        self.max_entries = max_entries
+        self._lock = Lock()
+        # name -> [score at last launch, time of last launch, last resolved path]
+        self._entries = self._load()
+
+    def record(self, name, path=None):
+        """Count a launch of name, remembering the path it resolved to"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(name)
+            score = self._decayed(entry, now) if entry else 0.0
+            self._entries[name] = [score + 1.0, now, path or (entry[2] if entry else None)]
+            self._save()
+
+    def rank(self, names):
+        """names reordered by score, keeping the given order among equal scores"""
+        now = time.time()
+        entries = self._entries
+        return sorted(names, key=lambda name: -self._decayed(entries[name], now) if name in entries else 0.0)
+
+    def top(self, count):
+        """The count highest-scoring entries as (name, last path) pairs"""
+        now = time.time()
+        with self._lock:
+            ranked = sorted(self._entries.items(), key=lambda item: -self._decayed(item[1], now))
+        return [(name, entry[2]) for name, entry in ranked[:count]]
+
+    def _decayed(self, entry, now):
+        return entry[0] * 0.5 ** (max(0.0, now - entry[1]) / self.half_life)
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == STORE_VERSION:
+                return data['entries']
+        except Exception:
+            pass
+        return {}
+
+    def _save(self):
+        """Write the store atomically, dropping the lowest scores beyond max_entries"""
+        if len(self._entries) > self.max_entries:
+            now = time.time()
+            keep = sorted(self._entries, key=lambda name: -self._decayed(self._entries[name], now))
+            self._entries = {name: self._entries[name] for name in keep[:self.max_entries]}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_file = self.path + '.tmp'
+            with open(temp_file, 'w') as f:
+                json.dump({'version': STORE_VERSION, 'entries': self._entries}, f, separators=(',', ':'))
+            os.replace(temp_file, self.path)
+        except Exception:
+            pass
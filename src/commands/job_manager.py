@@ -0,0 +1,137 @@
+import time
+import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Event
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once it has been cancelled"""
+
+
+class JobFailed(Exception):
+    """Raised by job functions to fail with a user-facing message"""
+
+
+class Job:
+    """A unit of background work, such as compiling and launching a file"""
+
+    def __init__(self, job_id, name):
+        self.id = job_id
+        self.name = name
+        self.state = 'queued'
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.process = None
+        self.future = None
+        self.cancelled = Event()
+
+    def elapsed(self):
+        start = self.started or self.submitted
+        return (self.finished or time.time()) - start
+
+
+class JobManager:
+    """Runs slow work off the GUI thread on a small worker pool.
+
+    Progress and results are reported through notify(), which the GUI
+    connects to a queued signal. Running jobs are cancelled by killing the
+    subprocess they are waiting on.
+    """
+
+    def __init__(self, notify, max_workers=4, history_size=20):
+        self.notify = notify
+        self.history_size = history_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs = OrderedDict()
+        self._next_id = 1
+        self._lock = Lock()
+
+    def submit(self, name, func):
+        """Queue func(job) to run on the pool; its return value is reported when it finishes"""
+        with self._lock:
+            job = Job(self._next_id, name)
+            self._next_id += 1
+            self._jobs[job.id] = job
+            # Forget the oldest finished jobs
+            while len(self._jobs) > self.history_size:
+                oldest = next(iter(self._jobs.values()))
+                if oldest.finished is None:
+                    break
+                self._jobs.popitem(last=False)
+        job.future = self._executor.submit(self._run, job, func)
+        return job
+
+    def progress(self, job, message):
+        """Report intermediate progress of a job"""
+        self.notify(f"[job #{job.id}] {message}")
+
+    def run_process(self, job, args):
+        """Run a subprocess for a job, killing it if the job is cancelled"""
+        if job.cancelled.is_set():
+            raise JobCancelled()
+        job.process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        try:
+            stdout, stderr = job.process.communicate()
+        finally:
+            returncode = job.process.returncode
+            job.process = None
+        if job.cancelled.is_set():
+            raise JobCancelled()
+        return subprocess.CompletedProcess(args, returncode, stdout, stderr)
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return f"No job #{job_id}"
+        if job.finished is not None:
+            return f"Job #{job_id} already {job.state}"
+
+        job.cancelled.set()
+        if job.future.cancel():
+            job.state = 'cancelled'
+            job.finished = time.time()
+            return f"Cancelled job #{job_id} before it started"
+        process = job.process
+        if process is not None:
+            try:
+                process.kill()
+            except OSError:
+                pass
+        return f"Cancelling job #{job_id}"
+
+    def list_jobs(self):
+        """List recent jobs with their state and duration"""
+        jobs = list(self._jobs.values())
+        if not jobs:
+            return "No jobs"
+        return "Jobs:\n" + "\n".join(
+            f"- #{job.id} {job.name}: {job.state} ({job.elapsed():.1f}s)" for job in jobs)
+
+    def _run(self, job, func):
+        if job.cancelled.is_set():
+            # cancel() came in as the pool picked the job up, too late for future.cancel()
+            job.state = 'cancelled'
+            job.result = "cancelled"
+            job.finished = time.time()
+            self.notify(f"[job #{job.id}] {job.result} ({job.elapsed():.1f}s)")
+            return
+        job.state = 'running'
+        job.started = time.time()
+        try:
+            job.result = func(job)
+            job.state = 'done'
+        except JobCancelled:
+            job.state = 'cancelled'
+            job.result = "cancelled"
+        except JobFailed as e:
+            job.state = 'failed'
+            job.result = str(e)
+        except Exception as e:
+            job.state = 'failed'
+            job.result = f"Error: {str(e)}"
+        job.finished = time.time()
+        self.notify(f"[job #{job.id}] {job.result} ({job.elapsed():.1f}s)")
@@ -0,0 +1,146 @@
+import os
+import sys
+import mmap
+import time
+import struct
+from threading import Thread, Event, Lock
+
+# Get the project root directory
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Add the root directory to Python path
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from src.config import CACHE_DIR
+
+METRICS_FILE = os.path.join(CACHE_DIR, 'metrics.ring')
+# Seconds between recorded samples
+RECORD_INTERVAL = 10
+# A week of samples at RECORD_INTERVAL: 60480 records of 24 bytes, about 1.4 MB
+DEFAULT_CAPACITY = 7 * 24 * 3600 // RECORD_INTERVAL
+
+MAGIC = b'CLIM'
+FILE_VERSION = 1
+# magic, version, record size, capacity, next slot, records stored
+HEADER = struct.Struct('<4sHHIII')
+# time, cpu %, memory %, disk %, 1-minute load
+RECORD = struct.Struct('<dffff')
+FIELDS = ['CPU', 'Memory', 'Disk', 'Load']
+
+
+class MetricsRing:
+    """Fixed-size ring of metric records in a memory-mapped file.
+
+    Records are written in place with struct.pack_into, so appending
+    allocates nothing and the file never grows. Records are in time
+    order, which lets readers walk back from the newest one and stop at
+    the start of the window they need.
+    """
+
+    def __init__(self, path=METRICS_FILE, capacity=DEFAULT_CAPACITY, create=True):
+        self.path = path
+        size = HEADER.size + capacity * RECORD.size
+        if create:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        else:
+            fd = os.open(path, os.O_RDWR)
+        try:
+            existing = os.fstat(fd).st_size
+            valid = existing >= HEADER.size and self._valid(os.read(fd, HEADER.size), existing)
+            if not valid:
+                if not create:
+                    raise ValueError(f"{path} is not a metrics ring file")
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, 0 if valid else size)
+        finally:
+            os.close(fd)
+
+        if valid:
+            _, _, _, self.capacity, self.next, self.count = HEADER.unpack_from(self._map, 0)
+        else:
+            self.capacity, self.next, self.count = capacity, 0, 0
+            self._write_header()
+        self._lock = Lock()
+
+    def append(self, timestamp, cpu, memory, disk, load):
+        """Write one record over the oldest slot"""
+        with self._lock:
+            RECORD.pack_into(self._map, HEADER.size + self.next * RECORD.size, timestamp, cpu, memory, disk, load)
+            self.next = (self.next + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+            self._write_header()
+
+    def since(self, cutoff):
+        """Records newer than cutoff, newest first, read straight from the map"""
+        with self._lock:
+            next_slot, count = self.next, self.count
+        for i in range(count):
+            slot = (next_slot - 1 - i) % self.capacity
+            record = RECORD.unpack_from(self._map, HEADER.size + slot * RECORD.size)
+            if record[0] < cutoff:
+                return
+            yield record
+
+    def summary(self, window):
+        """(samples, oldest time, [(min, avg, max) per field]) over the last window seconds"""
+        count = 0
+        oldest = None
+        lows = [float('inf')] * len(FIELDS)
+        highs = [float('-inf')] * len(FIELDS)
+        totals = [0.0] * len(FIELDS)
+        for record in self.since(time.time() - window):
+            count += 1
+            oldest = record[0]
+            for i, value in enumerate(record[1:]):
+                lows[i] = min(lows[i], value)
+                highs[i] = max(highs[i], value)
+                totals[i] += value
+        if not count:
+            return 0, None, []
+        return count, oldest, [(lows[i], totals[i] / count, highs[i]) for i in range(len(FIELDS))]
+
+    def size(self):
+        return len(self._map)
+
+    def close(self):
+        with self._lock:
+            self._map.flush()
+            self._map.close()
+
+    def _valid(self, header, file_size):
+        magic, version, record_size, capacity, next_slot, count = HEADER.unpack(header)
+        return (magic == MAGIC and version == FILE_VERSION and record_size == RECORD.size
+                and capacity > 0 and next_slot < capacity and count <= capacity
+                and file_size == HEADER.size + capacity * RECORD.size)
+
+    def _write_header(self):
+        HEADER.pack_into(self._map, 0, MAGIC, FILE_VERSION, RECORD.size, self.capacity, self.next, self.count)
+
+
+class MetricsRecorder:
+    """Copies the system sampler's readings into a MetricsRing every interval seconds"""
+
+    def __init__(self, sampler, path=METRICS_FILE, interval=RECORD_INTERVAL, capacity=DEFAULT_CAPACITY):
+        self.sampler = sampler
+        self.interval = interval
+        self.ring = MetricsRing(path, capacity)
+        self._stop = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop recording and flush the file"""
+        self._stop.set()
+        self._thread.join(2)
+        self.ring.close()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            snapshot = self.sampler.snapshot()
+            if snapshot is None:
+                continue
+            _, sample, _ = snapshot
+            self.ring.append(sample['time'], sample['cpu_percent'], sample['memory_percent'],
+                             sample['disk_percent'] or 0.0, sample['load'][0] if sample['load'] else 0.0)
@@ -0,0 +1,161 @@
+import time
+from collections import deque
+from threading import Thread, Lock, Event
+
+# Longest line kept in a buffer; longer output is split into several lines
+MAX_LINE_BYTES = 4096
+# Seconds between batched updates sent to followers
+FOLLOW_INTERVAL = 0.25
+# Most lines sent to a follower in one batch; the rest are summarized
+MAX_BATCH_LINES = 200
+# Buffers of exited programs kept for 'logs'; the least recently used are dropped
+MAX_EXITED_BUFFERS = 20
+
+
+class OutputBuffer:
+    """Fixed-size ring buffer of one process's output lines"""
+
+    def __init__(self, max_lines=1000):
+        self.lines = deque(maxlen=max_lines)
+        # Number of lines ever appended, used as a cursor by followers
+        self.total = 0
+        self.closed = False
+        self._lock = Lock()
+
+    def append(self, line):
+        with self._lock:
+            self.lines.append(line)
+            self.total += 1
+
+    def tail(self, count):
+        with self._lock:
+            return list(self.lines)[-count:]
+
+    def since(self, cursor):
+        """Lines appended after cursor that are still buffered, the number lost, and the new cursor"""
+        with self._lock:
+            new = self.total - cursor
+            available = min(new, len(self.lines))
+            lines = list(self.lines)[len(self.lines) - available:] if available else []
+            return lines, new - available, self.total
+
+
+class OutputCapture:
+    """Captures launched programs' stdout/stderr into per-program ring buffers.
+
+    Each process gets a reader thread that drains its pipe, so programs
+    never block on a full pipe even when nobody is looking at the output.
+    Followed programs have new lines pushed through notify() in batches
+    every FOLLOW_INTERVAL seconds. Buffers of running programs are always
+    kept; those of exited programs only up to MAX_EXITED_BUFFERS.
+    """
+
+    def __init__(self, notify, max_lines=1000):
+        self.notify = notify
+        self.max_lines = max_lines
+        self.buffers = {}
+        self._followers = {}
+        self._lock = Lock()
+        self._wake = Event()
+        self._follow_thread = None
+
+    def attach(self, name, stream):
+        """Start draining a process output stream into a fresh buffer for name"""
+        buffer = OutputBuffer(self.max_lines)
+        with self._lock:
+            self.buffers.pop(name, None)
+            self.buffers[name] = buffer
+        Thread(target=self._pump, args=(name, stream, buffer), daemon=True).start()
+        return buffer
+
+    def tail(self, name, count=50):
+        """The last count lines of a program's output"""
+        buffer = self.buffers.get(name)
+        if buffer is None:
+            return f"No output captured for '{name}'"
+        self._touch(name, buffer)
+        lines = buffer.tail(count)
+        if not lines:
+            return f"No output from {name} yet"
+        state = " (exited)" if buffer.closed else ""
+        return f"Last {len(lines)} lines of {name}{state}:\n" + "\n".join(lines)
+
+    def follow(self, name):
+        """Stream new output lines of a program until it exits or unfollow() is called"""
+        buffer = self.buffers.get(name)
+        if buffer is None:
+            return f"No output captured for '{name}'"
+        with self._lock:
+            self._followers[name] = (buffer, buffer.total)
+            if self._follow_thread is None:
+                self._follow_thread = Thread(target=self._follow_loop, daemon=True)
+                self._follow_thread.start()
+        self._wake.set()
+        return f"Following {name}; 'logs {name} stop' to stop"
+
+    def unfollow(self, name=None):
+        """Stop following one program, or all of them"""
+        with self._lock:
+            if name is None:
+                count = len(self._followers)
+                self._followers.clear()
+                return f"Stopped following {count} programs"
+            if self._followers.pop(name, None) is None:
+                return f"Not following {name}"
+        return f"Stopped following {name}"
+
+    def _touch(self, name, buffer):
+        """Mark a buffer as most recently used, then drop the oldest exited ones over the bound"""
+        with self._lock:
+            if self.buffers.get(name) is buffer:
+                # Dicts keep insertion order, so re-inserting moves the buffer to the end
+                del self.buffers[name]
+                self.buffers[name] = buffer
+            exited = [key for key, value in self.buffers.items() if value.closed]
+            for key in exited[:max(0, len(exited) - MAX_EXITED_BUFFERS)]:
+                if key not in self._followers:
+                    del self.buffers[key]
+
+    def _pump(self, name, stream, buffer):
+        try:
+            for raw in iter(lambda: stream.readline(MAX_LINE_BYTES), b''):
+                buffer.append(raw.decode('utf-8', errors='replace').rstrip('\r\n'))
+        except (OSError, ValueError):
+            pass
+        finally:
+            buffer.closed = True
+            try:
+                stream.close()
+            except OSError:
+                pass
+            self._touch(name, buffer)
+
+    def _follow_loop(self):
+        while True:
+            self._wake.wait()
+            time.sleep(FOLLOW_INTERVAL)
+            with self._lock:
+                followers = list(self._followers.items())
+                if not followers:
+                    self._wake.clear()
+                    continue
+
+            for name, (buffer, cursor) in followers:
+                closed = buffer.closed
+                lines, dropped, cursor = buffer.since(cursor)
+                if lines or dropped:
+                    self.notify(self._format_batch(name, lines, dropped))
+                with self._lock:
+                    if name in self._followers and self._followers[name][0] is buffer:
+                        if closed:
+                            del self._followers[name]
+                        else:
+                            self._followers[name] = (buffer, cursor)
+                if closed:
+                    self.notify(f"[{name}] process exited")
+
+    def _format_batch(self, name, lines, dropped):
+        skipped = dropped + max(0, len(lines) - MAX_BATCH_LINES)
+        lines = lines[-MAX_BATCH_LINES:]
+        header = f"[{name}]" + (f" ({skipped} lines skipped)" if skipped else "")
+        return header + "\n" + "\n".join(lines)
@@ -0,0 +1,185 @@
+import time
+import psutil
+from array import array
+from threading import Thread, Event, Lock
+
+# Seconds between samples
+MONITOR_INTERVAL = 1.0
+# Samples of history kept per program
+HISTORY_SIZE = 60
+SPARK_CHARS = '▁▂▃▄▅▆▇█'
+
+
+class RingBuffer:
+    """Fixed-size ring of numbers stored in a preallocated array"""
+
+    def __init__(self, size, typecode='d'):
+        self._data = array(typecode, [0]) * size
+        self._next = 0
+        self.count = 0
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % len(self._data)
+        self.count = min(self.count + 1, len(self._data))
+
+    def values(self):
+        """Stored values, oldest first"""
+        if self.count < len(self._data):
+            return self._data[:self.count].tolist()
+        return (self._data[self._next:] + self._data[:self._next]).tolist()
+
+    def latest(self):
+        return self._data[self._next - 1] if self.count else 0
+
+
+class ProgramStats:
+    """Sampled history of one launched program's process tree"""
+
+    def __init__(self, name, pid, history_size):
+        self.name = name
+        self.pid = pid
+        self.cpu = RingBuffer(history_size, 'd')
+        self.rss = RingBuffer(history_size, 'Q')
+        self.threads = RingBuffer(history_size, 'L')
+        self.read_rate = RingBuffer(history_size, 'd')
+        self.write_rate = RingBuffer(history_size, 'd')
+        self._last_io = None
+
+    def update(self, now, cpu, rss, threads, io):
+        self.cpu.append(cpu)
+        self.rss.append(rss)
+        self.threads.append(threads)
+        if io is not None and self._last_io is not None:
+            elapsed = max(now - self._last_io[0], 1e-6)
+            # Totals drop when a child exits; count that as no IO rather than negative
+            self.read_rate.append(max(0.0, (io[0] - self._last_io[1]) / elapsed))
+            self.write_rate.append(max(0.0, (io[1] - self._last_io[2]) / elapsed))
+        self._last_io = (now, io[0], io[1]) if io is not None else None
+
+    def row(self, processes):
+        """Immutable summary of the latest sample, used for rendering and diffing"""
+        io_known = self._last_io is not None
+        return (self.name, self.pid, processes, round(self.cpu.latest(), 1), self.rss.latest(),
+                self.threads.latest(), self.read_rate.latest() if io_known else None,
+                self.write_rate.latest() if io_known else None, sparkline(self.cpu.values()[-20:]))
+
+
+class ProcessMonitor:
+    """Samples CPU, memory, threads and IO of launched programs in a background thread.
+
+    Every process in a program's tree is read inside psutil's oneshot(),
+    so each one costs a single pass over its /proc files per tick. Each
+    tick publishes an immutable tuple of rows and calls the subscribers
+    once, from the sampling thread. With a supervisor, each sample also
+    updates the peak RSS of the program's ProcessRecord.
+    """
+
+    def __init__(self, running_processes, interval=MONITOR_INTERVAL, history_size=HISTORY_SIZE, supervisor=None):
+        self.running_processes = running_processes
+        self.supervisor = supervisor
+        self.interval = interval
+        self.history_size = history_size
+        self.rows = ()
+        self.generation = 0
+        self.stats = {}
+        self._handles = {}
+        self._subscribers = []
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling in a background thread"""
+        if self._thread is None:
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def subscribe(self, callback):
+        """Call callback(rows) after every tick"""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _run(self):
+        while True:
+            try:
+                rows = self._sample()
+            except Exception:
+                rows = self.rows
+            with self._lock:
+                self.rows = rows
+                self.generation += 1
+                subscribers = list(self._subscribers)
+            for callback in subscribers:
+                callback(rows)
+            if self._stop.wait(self.interval):
+                return
+
+    def _sample(self):
+        now = time.monotonic()
+        rows = []
+        handles = {}
+        stats = {}
+
+        for name, process in list(self.running_processes.items()):
+            program = self.stats.get(name)
+            if program is None or program.pid != process.pid:
+                program = ProgramStats(name, process.pid, self.history_size)
+            stats[name] = program
+
+            try:
+                members = [process.pid] + [child.pid for child in psutil.Process(process.pid).children(recursive=True)]
+            except psutil.Error:
+                continue
+
+            cpu = 0.0
+            rss = 0
+            threads = 0
+            io = [0, 0]
+            count = 0
+            for pid in members:
+                try:
+                    # Reuse the handle from the last tick so cpu_percent() measures since then
+                    proc = self._handles.get(pid) or psutil.Process(pid)
+                    with proc.oneshot():
+                        cpu += proc.cpu_percent(None)
+                        rss += proc.memory_info().rss
+                        threads += proc.num_threads()
+                        if io is not None:
+                            try:
+                                counters = proc.io_counters()
+                                io[0] += counters.read_bytes
+                                io[1] += counters.write_bytes
+                            except (psutil.AccessDenied, AttributeError, NotImplementedError):
+                                io = None
+                except psutil.Error:
+                    continue
+                handles[pid] = proc
+                count += 1
+
+            program.update(now, cpu, rss, threads, io)
+            record = self.supervisor.record_for(process) if self.supervisor else None
+            if record is not None:
+                record.sample_rss(rss)
+            rows.append(program.row(count))
+
+        self._handles = handles
+        self.stats = stats
+        return tuple(rows)
+
+
+def sparkline(values):
+    """Tiny bar chart of values, scaled to their maximum (at least 100 for CPU percentages)"""
+    if not values:
+        return ''
+    top = max(max(values), 100.0)
+    return ''.join(SPARK_CHARS[min(len(SPARK_CHARS) - 1, int(value / top * len(SPARK_CHARS)))] for value in values)
@@ -0,0 +1,235 @@
+import os
+import time
+import signal
+import select
+import psutil
+from collections import deque
+from threading import Thread, Lock, Event
+
+# Seconds between liveness checks when pidfd is not available
+POLL_INTERVAL = 0.2
+
+
+class ProcessRecord:
+    """Bookkeeping for one launched process"""
+
+    def __init__(self, name, process):
+        self.name = name
+        self.process = process
+        self.pid = process.pid
+        self.started = time.time()
+        self.runtime = None
+        self.returncode = None
+        # Largest tree RSS seen in psutil samples; None if the process was never sampled
+        self.peak_rss = None
+        self.pidfd = None
+        # Not our child (e.g. a Python pool script): its exit is signalled by process.exited
+        self.external = hasattr(process, 'exited')
+        self.exited = Event()
+
+    def sample_rss(self, rss):
+        """Fold one RSS sample of the process tree into the peak"""
+        if self.peak_rss is None or rss > self.peak_rss:
+            self.peak_rss = rss
+
+
+class ProcessSupervisor:
+    """Reaps launched programs as they exit and keeps the running table accurate.
+
+    On Linux each child gets a pidfd registered with a single poll() loop,
+    so an exit costs one wakeup and one wait4() for that child only. Other
+    platforms fall back to checking the tracked processes every
+    POLL_INTERVAL seconds.
+    """
+
+    def __init__(self, running_processes, history_size=50):
+        self.running_processes = running_processes
+        self.history = deque(maxlen=history_size)
+        self._records = {}
+        self._by_fd = {}
+        self._lock = Lock()
+        self._use_pidfd = hasattr(os, 'pidfd_open') and hasattr(select, 'poll')
+        if self._use_pidfd:
+            self._poller = select.poll()
+            self._wake_read, self._wake_write = os.pipe()
+            os.set_blocking(self._wake_read, False)
+            self._poller.register(self._wake_read, select.POLLIN)
+        Thread(target=self._run, daemon=True).start()
+
+    def track(self, name, process):
+        """Register a launched process under name, or name#2, name#3... while name is taken"""
+        with self._lock:
+            unique = name
+            count = 1
+            while unique in self.running_processes:
+                count += 1
+                unique = f"{name}#{count}"
+            record = ProcessRecord(unique, process)
+            self.running_processes[unique] = process
+            self._records[process.pid] = record
+            if record.external:
+                Thread(target=self._wait_external, args=(record,), daemon=True).start()
+            elif self._use_pidfd:
+                try:
+                    record.pidfd = os.pidfd_open(process.pid)
+                    self._by_fd[record.pidfd] = record
+                    self._poller.register(record.pidfd, select.POLLIN)
+                except OSError:
+                    record.pidfd = None
+        if self._use_pidfd and not record.external:
+            os.write(self._wake_write, b'\0')
+        return record
+
+    def record_for(self, process):
+        """The ProcessRecord of a tracked process, or None"""
+        return self._records.get(process.pid)
+
+    def wait(self, process, timeout):
+        """Wait for a tracked process to be reaped; returns whether it exited in time"""
+        record = self.record_for(process)
+        if record is None:
+            try:
+                process.wait(timeout=timeout)
+                return True
+            except Exception:
+                return False
+        return record.exited.wait(timeout)
+
+    def descendants(self, process):
+        """Every live descendant of a process, found through psutil"""
+        try:
+            return psutil.Process(process.pid).children(recursive=True)
+        except psutil.Error:
+            return []
+
+    def signal_tree(self, process, kill=False):
+        """Signal a process, its process group and all its descendants in one pass.
+
+        Descendants are collected before anything is signalled, since they
+        are re-parented (and lost to the tree walk) once their parent dies.
+        Returns the descendants so callers can wait for them.
+        """
+        members = self.descendants(process)
+
+        signalled = False
+        if os.name == 'posix':
+            # Launched programs lead their own session; never signal the bot's own group
+            try:
+                if os.getpgid(process.pid) == process.pid:
+                    os.killpg(process.pid, signal.SIGKILL if kill else signal.SIGTERM)
+                    signalled = True
+            except (ProcessLookupError, PermissionError):
+                pass
+
+        if not signalled:
+            try:
+                process.kill() if kill else process.terminate()
+            except ProcessLookupError:
+                pass
+        for member in members:
+            try:
+                member.kill() if kill else member.terminate()
+            except psutil.Error:
+                pass
+        return members
+
+    def wait_members(self, members, timeout):
+        """Wait for descendants to exit; returns the ones still alive at the deadline.
+
+        Descendants are not our children, so they cannot be waited on
+        directly. Zombies count as gone: their parent (or init) reaps them
+        on its own schedule.
+        """
+        deadline = time.monotonic() + timeout
+        alive = list(members)
+        while alive:
+            alive = [member for member in alive if _is_alive(member)]
+            if not alive or time.monotonic() >= deadline:
+                break
+            time.sleep(0.02)
+        return alive
+
+    def _run(self):
+        while True:
+            if self._use_pidfd:
+                # Processes whose pidfd could not be opened are still polled
+                timeout = POLL_INTERVAL * 1000 if self._has_unwatched() else None
+                for fd, _ in self._poller.poll(timeout):
+                    if fd == self._wake_read:
+                        self._drain_wakeups()
+                    else:
+                        record = self._by_fd.get(fd)
+                        if record:
+                            self._reap(record)
+                self._check_unwatched()
+            else:
+                time.sleep(POLL_INTERVAL)
+                self._check_unwatched()
+
+    def _has_unwatched(self):
+        return any(record.pidfd is None and not record.external for record in list(self._records.values()))
+
+    def _check_unwatched(self):
+        for record in list(self._records.values()):
+            if record.pidfd is None and not record.external:
+                self._reap(record)
+
+    def _wait_external(self, record):
+        record.process.exited.wait()
+        self._reap(record)
+
+    def _drain_wakeups(self):
+        try:
+            while os.read(self._wake_read, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _reap(self, record):
+        """Collect the exit status of a process if it has exited"""
+        process = record.process
+        if record.external:
+            if not process.exited.is_set():
+                return
+        elif hasattr(os, 'wait4'):
+            try:
+                pid, status, _ = os.wait4(record.pid, os.WNOHANG)
+                if pid == 0:
+                    return
+                process.returncode = os.waitstatus_to_exitcode(status)
+            except ChildProcessError:
+                # Already reaped elsewhere (e.g. Popen.wait), or not our child at all
+                if process.poll() is None:
+                    # A readable pidfd we cannot wait on would wake poll() forever; poll instead
+                    self._unwatch(record)
+                    return
+        elif process.poll() is None:
+            return
+
+        record.returncode = process.returncode
+        record.runtime = time.time() - record.started
+
+        self._unwatch(record)
+        with self._lock:
+            self._records.pop(record.pid, None)
+            if self.running_processes.get(record.name) is process:
+                del self.running_processes[record.name]
+            self.history.append(record)
+        record.exited.set()
+
+
+    def _unwatch(self, record):
+        """Stop watching a record's pidfd"""
+        with self._lock:
+            if record.pidfd is not None:
+                self._by_fd.pop(record.pidfd, None)
+                self._poller.unregister(record.pidfd)
+                os.close(record.pidfd)
+                record.pidfd = None
+
+
+def _is_alive(proc):
+    try:
+        return proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE
+    except psutil.Error:
+        return False
@@ -0,0 +1,359 @@
+import os
+import json
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+# Get the project root directory
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Add the root directory to Python path
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from src.config import CACHE_DIR
+from src.commands.program_matcher import prefix_matches, fuzzy_matches
+from src.commands.program_table import NameArray, ProgramTable
+
+PROGRAM_CACHE_FILE = os.path.join(CACHE_DIR, 'programs.json')
+CACHE_VERSION = 3
+MAX_SCAN_WORKERS = 8
+
+
+class ProgramSnapshot:
+    """Immutable view of the index, replaced wholesale when a scan completes.
+
+    The sorted name array is built once here, on the scanning thread, so
+    completion and listing never have to sort the index again. It covers
+    both executables (a compact ProgramTable of name -> path) and desktop
+    applications (name -> argv).
+    """
+
+    def __init__(self, generation, programs, applications=None):
+        self.generation = generation
+        self.applications = applications or {}
+        self.names = NameArray(sorted(programs.keys() | self.applications.keys()))
+        self.programs = ProgramTable(self.names, programs)
+        self._blob = self.names.blob
+
+    def command(self, name):
+        """argv that launches name, or None; executables win over applications"""
+        path = self.programs.get(name)
+        if path:
+            return [path]
+        argv = self.applications.get(name)
+        return list(argv) if argv else None
+
+    def complete(self, prefix, limit=None):
+        """Program names starting with prefix, in sorted order"""
+        return prefix_matches(self.names, prefix, limit)
+
+    def match(self, query, limit=10):
+        """Program names ranked by how well they fuzzy-match query"""
+        return fuzzy_matches(self.names, self._blob, query, limit)
+
+
+class ProgramIndex:
+    """Index of executables, persisted to disk and keyed by directory mtime.
+
+    Scans build a private dict and publish it as a new ProgramSnapshot in a
+    single attribute assignment, so readers never see a half-built index.
+    Cached directory listings are kept packed, one newline-joined string
+    per directory, so they do not hold a str object per program name.
+    Updates (full scans and incremental changes) are serialized with each
+    other; lookups never take a lock.
+    """
+
+    def __init__(self, cache_file=PROGRAM_CACHE_FILE):
+        self.cache_file = cache_file
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.snapshot = ProgramSnapshot(0, {})
+        self.directories = []
+        self.applications = {}
+        self.progress = None
+        self._generation = 0
+        self._lock = Lock()
+        self._update_lock = Lock()
+        self._directories = self._load_cache()
+
+    def begin_scan(self, directories):
+        """Start a new scan generation and return its number"""
+        with self._lock:
+            self._generation += 1
+            self.directories = list(directories)
+            self.progress = (0, len(directories))
+            return self._generation
+
+    def publish(self, programs, generation):
+        """Swap in the programs found by a scan, unless a newer scan already published"""
+        with self._lock:
+            if generation < self.snapshot.generation:
+                return False
+            self.snapshot = ProgramSnapshot(generation, programs, self.applications)
+            if generation == self._generation:
+                self.progress = None
+            return True
+
+    def set_applications(self, applications):
+        """Publish desktop applications (name -> argv) alongside the indexed executables"""
+        with self._update_lock:
+            with self._lock:
+                self.applications = applications
+                self._generation += 1
+                generation = self._generation
+            self.publish(self.snapshot.programs.to_dict(), generation)
+
+    def command(self, name):
+        """argv that launches name, resolving executables like resolve()"""
+        path = self.resolve(name)
+        return [path] if path else self.snapshot.command(name)
+
+    def preresolve(self, candidates):
+        """Publish likely programs ahead of the first scan.
+
+        candidates maps names to their last known paths. Names are
+        re-resolved against the directory order where possible, so a stale
+        path never shadows the provider a scan would pick; the first scan
+        replaces this snapshot entirely.
+        """
+        programs = {}
+        for name, path in candidates.items():
+            found = self._first_provider(name) if self.directories else None
+            if found is None and path and _is_executable(path):
+                found = path
+            if found:
+                programs[name] = found
+        if programs:
+            self.publish(programs, 0)
+        return programs
+
+    def scan(self, directories, force=False):
+        """Scan directories concurrently, only re-listing the ones whose mtime changed.
+
+        Directories are given in precedence order: when two of them provide
+        the same name, the earlier one wins, as it would on $PATH.
+        """
+        with self._update_lock:
+            return self._scan(directories, force)
+
+    def _scan(self, directories, force):
+        generation = self.begin_scan(directories)
+        hits = 0
+        misses = 0
+        scanned = {}
+        programs = {}
+
+        workers = max(1, min(MAX_SCAN_WORKERS, len(directories)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda d: self._revalidate(d, generation, force), directories)
+
+            for directory, (mtime, names, hit) in zip(directories, results):
+                if mtime is None:
+                    continue
+                if hit:
+                    hits += 1
+                else:
+                    misses += 1
+
+                scanned[directory] = {'mtime': mtime, 'names': _pack(names)}
+                for name in names:
+                    programs.setdefault(name.lower(), os.path.join(directory, name))
+
+        if not self.publish(programs, generation):
+            return programs
+
+        with self._lock:
+            changed = misses > 0 or scanned.keys() != self._directories.keys()
+            self._directories = scanned
+            self.cache_hits = hits
+            self.cache_misses = misses
+            if changed:
+                self._save_cache()
+        return programs
+
+    def resolve(self, name):
+        """Look a name up in the published snapshot, falling back to a direct stat of each directory.
+
+        The fallback lets a single program be found while the first scan is
+        still running, or after it was installed since the last scan.
+        """
+        path = self.snapshot.programs.get(name)
+        if path:
+            return path
+        if not name or os.sep in name or (os.altsep and os.altsep in name):
+            return None
+
+        return self._first_provider(name)
+
+    def apply_changes(self, changes):
+        """Apply a batch of filesystem changes and publish a single new snapshot.
+
+        changes maps a directory to the set of file names that were added,
+        removed or had their mode changed, or to None when the whole
+        directory must be re-listed. Only the affected names are re-resolved
+        against the directory precedence order.
+        """
+        with self._update_lock:
+            with self._lock:
+                self._generation += 1
+                generation = self._generation
+
+            directories = dict(self._directories)
+            affected = set()
+            for directory, names in changes.items():
+                try:
+                    mtime = os.stat(directory).st_mtime_ns
+                except OSError:
+                    old = directories.pop(directory, None)
+                    if old:
+                        affected.update(_unpack(old['names']))
+                    continue
+
+                old_names = _unpack(directories.get(directory, {}).get('names', ''))
+                if names is None:
+                    new_names = self._scan_directory(directory)
+                    affected.update(set(old_names) ^ set(new_names))
+                else:
+                    current = set(old_names)
+                    for name in names:
+                        if _is_executable(os.path.join(directory, name)):
+                            current.add(name)
+                        else:
+                            current.discard(name)
+                    new_names = sorted(current)
+                    affected.update(names)
+                directories[directory] = {'mtime': mtime, 'names': _pack(new_names)}
+
+            programs = self.snapshot.programs.to_dict()
+            for name in affected:
+                path = self._first_provider(name)
+                if path:
+                    programs[name.lower()] = path
+                else:
+                    programs.pop(name.lower(), None)
+
+            if self.publish(programs, generation):
+                with self._lock:
+                    self._directories = directories
+                    self._save_cache()
+            return len(affected)
+
+    def stale_directories(self):
+        """Indexed directories whose mtime no longer matches the cached listing"""
+        stale = []
+        for directory in self.directories:
+            cached = self._directories.get(directory)
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                if cached:
+                    stale.append(directory)
+                continue
+            if not cached or cached['mtime'] != mtime:
+                stale.append(directory)
+        return stale
+
+    def _first_provider(self, name):
+        """Path of name in the first directory that provides it, by direct stat"""
+        for directory in self.directories:
+            candidate = os.path.join(directory, name)
+            if _is_executable(candidate):
+                return candidate
+        return None
+
+    def scan_progress(self):
+        """Return (directories done, directories total) of the running scan, or None when idle"""
+        return self.progress
+
+    def clear(self):
+        """Forget all cached directory listings"""
+        with self._lock:
+            self._directories = {}
+            try:
+                os.remove(self.cache_file)
+            except OSError:
+                pass
+
+    def _revalidate(self, directory, generation, force=False):
+        """Return (mtime, names, cache_hit) for a directory, or (None, None, False) if it is missing"""
+        try:
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                return None, None, False
+
+            cached = self._directories.get(directory)
+            if not force and cached and cached['mtime'] == mtime:
+                return mtime, _unpack(cached['names']), True
+            return mtime, self._scan_directory(directory), False
+        finally:
+            self._advance(generation)
+
+    def _advance(self, generation):
+        """Count one more directory done for the newest running scan"""
+        with self._lock:
+            if generation == self._generation and self.progress:
+                done, total = self.progress
+                self.progress = (done + 1, total)
+
+    def _scan_directory(self, directory):
+        """List the executables in a single directory.
+
+        os.scandir answers is_file() from the directory entry type, so only
+        one stat per regular file is needed to read its permission bits.
+        """
+        names = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file() and entry.stat().st_mode & 0o111:
+                            names.append(entry.name)
+                    except OSError:
+                        continue
+        except (PermissionError, OSError):
+            pass
+        return names
+
+    def _load_cache(self):
+        """Load cached directory listings from disk"""
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                return data['directories']
+        except Exception:
+            pass
+        return {}
+
+    def _save_cache(self):
+        """Write directory listings to disk atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            temp_file = self.cache_file + '.tmp'
+            with open(temp_file, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'directories': self._directories}, f)
+            os.replace(temp_file, self.cache_file)
+        except Exception:
+            pass
+
+
+def _pack(names):
+    """One directory listing as a single newline-joined string"""
+    return '\n'.join(names)
+
+
+def _unpack(packed):
+    """The names of a listing packed by _pack()"""
+    return packed.split('\n') if packed else []
+
+
+def _is_executable(path):
+    """Whether path is a regular file with an execute bit set"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return stat.S_ISREG(st.st_mode) and bool(st.st_mode & 0o111)
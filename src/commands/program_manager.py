@@ -1,13 +1,31 @@
 import os
+import re
+import shlex
+import shutil
 import platform
 import psutil
 import subprocess
 import webbrowser
 from threading import Thread
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from colorama import Fore, Style
 import time
 import sys
+from src.commands.program_index import ProgramIndex
+from src.commands.program_watcher import ProgramWatcher
+from src.commands.process_supervisor import ProcessSupervisor
+from src.commands.build_cache import BuildCache
+from src.commands.job_manager import JobManager, JobFailed
+from src.commands.output_capture import OutputCapture
+from src.commands.python_pool import PythonPool
+from src.commands import fast_spawn
+from src.commands.frecency import FrecencyStore
+from src.commands.desktop_entries import DesktopEntryIndex
+from src.commands.system_sampler import SystemSampler
+from src.commands.process_monitor import ProcessMonitor
+from src.commands.metrics_recorder import MetricsRecorder, MetricsRing, METRICS_FILE, FIELDS
+from src.utils.display import format_bytes
 
 # Get the project root directory
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -17,10 +35,35 @@ WORKSPACE_DIR = os.path.join(ROOT_DIR, 'workspace')
 if ROOT_DIR not in sys.path:
     sys.path.append(ROOT_DIR)
 
+# Most targets of one 'open a, b, c' launched at the same time
+MAX_PARALLEL_LAUNCHES = 8
+# Most frequently used programs resolved at startup, before the first scan
+PRERESOLVE_COUNT = 20
+
 class ProgramManager:
     def __init__(self):
-        self.program_paths = {}
+        self.program_index = ProgramIndex()
+        self.frecency = FrecencyStore()
+        # Human-friendly names from .desktop files ("open Text Editor"); Linux only
+        self.desktop_entries = DesktopEntryIndex() if platform.system() == 'Linux' else None
+        self.program_watcher = None
         self.running_processes = {}
+        self.process_supervisor = ProcessSupervisor(self.running_processes)
+        self.build_cache = BuildCache()
+        self.jobs = JobManager(self._notify)
+        self.output_capture = OutputCapture(self._notify)
+        # Warm interpreters for workspace .py scripts; off until enabled
+        self.python_pool = None
+        # Named target lists for 'open @name'; loaded from and saved to settings by the GUI
+        self.launch_profiles = {}
+        self.system_sampler = SystemSampler()
+        self.system_sampler.start()
+        self.process_monitor = ProcessMonitor(self.running_processes, supervisor=self.process_supervisor)
+        self.process_monitor.start()
+        # Persisted CPU/memory/disk/load history; off until enabled
+        self.metrics_recorder = None
+        # Called with messages from background work (e.g. 'close all'); set by the GUI
+        self.output_callback = None
         self.windows_apps = {
             'explorer': 'explorer.exe',
             'edge': 'msedge.exe',
@@ -41,7 +84,7 @@ class ProgramManager:
         # File type handlers
         self.file_handlers = {
             '.py': {'cmd': 'python', 'args': []},
-            '.java': {'cmd': 'javac', 'args': [], 'run_cmd': 'java'},
+            '.java': {'cmd': 'javac', 'args': ['-d', '{output_dir}'], 'run_cmd': 'java'},
             '.cpp': {'cmd': 'g++', 'args': ['-o', '{output}']},
             '.c': {'cmd': 'gcc', 'args': ['-o', '{output}']},
             '.bat': {'cmd': 'cmd.exe', 'args': ['/c']},
@@ -51,28 +94,31 @@ class ProgramManager:
             '.exe': {'cmd': '', 'args': []},  # Direct execution
         }
         
+        # Let lookups stat the program directories directly until the first scan is published
+        if platform.system() != 'Windows':
+            self.program_index.directories = self._unix_program_dirs()
+        # Make the usual programs available right away; the scan replaces them
+        self.program_index.preresolve(dict(self.frecency.top(PRERESOLVE_COUNT)))
+
         # Start scanning in background
         Thread(target=self._scan_programs, daemon=True).start()
-        # Add chrome specifically for web browsing
-        if platform.system() == 'Windows':
-            chrome_paths = [
-                os.path.join(os.environ.get('ProgramFiles', ''), 'Google/Chrome/Application/chrome.exe'),
-                os.path.join(os.environ.get('ProgramFiles(x86)', ''), 'Google/Chrome/Application/chrome.exe'),
-            ]
-            for path in chrome_paths:
-                if os.path.exists(path):
-                    self.program_paths['chrome'] = path
-                    break
 
-    def _scan_programs(self):
+    @property
+    def program_paths(self):
+        """Program name to path mapping from the latest completed scan"""
+        return self.program_index.snapshot.programs
+
+    def _scan_programs(self, force=False):
         """Scan and store program paths"""
         if platform.system() == 'Windows':
             self._scan_windows_programs()
         else:
-            self._scan_unix_programs()
+            self._scan_unix_programs(force)
 
     def _scan_windows_programs(self):
         """Scan Windows programs"""
+        generation = self.program_index.begin_scan([])
+        programs = {}
         system_dirs = [
             os.environ.get('SystemRoot', ''),
             os.path.join(os.environ.get('SystemRoot', ''), 'System32'),
@@ -90,38 +136,82 @@ class ProgramManager:
                     continue
                 app_path = os.path.join(directory, app_exe)
                 if os.path.exists(app_path):
-                    self.program_paths[app_name] = app_path
+                    programs[app_name] = app_path
                     break
 
-    def _scan_unix_programs(self):
-        """Scan Unix programs"""
+        # Add chrome specifically for web browsing
+        chrome_paths = [
+            os.path.join(os.environ.get('ProgramFiles', ''), 'Google/Chrome/Application/chrome.exe'),
+            os.path.join(os.environ.get('ProgramFiles(x86)', ''), 'Google/Chrome/Application/chrome.exe'),
+        ]
+        for path in chrome_paths:
+            if os.path.exists(path):
+                programs['chrome'] = path
+                break
+
+        self.program_index.publish(programs, generation)
+
+    def _scan_unix_programs(self, force=False):
+        """Scan Unix programs, reusing cached listings of unchanged directories"""
+        self.program_index.scan(self._unix_program_dirs(), force=force)
+        if self.desktop_entries is not None:
+            self.program_index.set_applications(self.desktop_entries.scan(force=force))
+
+        # Keep the index current from here on instead of rescanning
+        if self.program_watcher is None:
+            self.program_watcher = ProgramWatcher(self.program_index)
+            self.program_watcher.start()
+
+    def _unix_program_dirs(self):
+        """Every $PATH entry followed by the standard program directories, in precedence order"""
         unix_dirs = [
             '/usr/bin',
             '/usr/local/bin',
             '/opt',
             '/Applications'
         ]
-        
-        for directory in unix_dirs:
-            if not os.path.exists(directory):
-                continue
-            
-            try:
-                for item in os.listdir(directory):
-                    full_path = os.path.join(directory, item)
-                    if os.access(full_path, os.X_OK):
-                        self.program_paths[item.lower()] = full_path
-            except (PermissionError, OSError):
+
+        directories = []
+        seen = set()
+        for directory in os.environ.get('PATH', '').split(os.pathsep) + unix_dirs:
+            if not directory:
                 continue
+            directory = os.path.normpath(os.path.expanduser(directory))
+            if directory not in seen:
+                seen.add(directory)
+                directories.append(directory)
+        return directories
+
+    def rebuild_programs(self):
+        """Rescan all program directories, ignoring the on-disk cache"""
+        self.program_index.clear()
+        self._scan_programs(force=True)
+        return (f"Rebuilt program index: {len(self.program_paths)} programs "
+                f"(cache hits: {self.program_index.cache_hits}, "
+                f"misses: {self.program_index.cache_misses})")
 
     def open_program(self, program_name):
         """Open a program by name or path"""
         try:
-            program_name = program_name.lower()
+            # Explicit shell mode: run the command line through the system shell as typed
+            if program_name.startswith('--shell'):
+                command = program_name[7:].strip()
+                if not command:
+                    return "Usage: open --shell <command>"
+                name = command.split()[0].lower()
+                process = self._launch(name, command, shell=True)
+                return self._started(name, process)
+
+            if self._is_target_list(program_name):
+                return self.open_many(program_name)
+
+            # Arguments, URLs and paths keep their case; only program lookups are lowercased
+            original = program_name.strip()
+            program_name = original.lower()
             
             # Handle workspace files
             if program_name.startswith('workspace '):
-                file_name = program_name[10:].strip()
+                file_name = original[10:].strip()
                 file_path = os.path.join(WORKSPACE_DIR, file_name)
                 if os.path.exists(file_path):
                     return self._handle_file(file_path)
@@ -129,14 +219,15 @@ class ProgramManager:
             
             # Handle web URLs
             if program_name.startswith(('http://', 'https://', 'www.')):
+                url = original
                 if not program_name.startswith(('http://', 'https://')):
-                    program_name = 'https://' + program_name
-                webbrowser.open(program_name)
-                return f"Opening {program_name} in browser"
+                    url = 'https://' + url
+                webbrowser.open(url)
+                return f"Opening {url} in browser"
 
             # Handle file paths
-            if os.path.exists(program_name):
-                return self._handle_file(program_name)
+            if os.path.exists(original):
+                return self._handle_file(original)
             
             # Handle Windows special cases
             if platform.system() == 'Windows':
@@ -152,21 +243,123 @@ class ProgramManager:
             
             # Try to find and open the program
             try:
-                if program_name in self.program_paths:
-                    process = subprocess.Popen([self.program_paths[program_name]])
-                    self.running_processes[program_name] = process
-                    return f"Started {program_name}"
-                
-                # Try system commands first
-                process = subprocess.Popen([program_name], shell=True)
-                self.running_processes[program_name] = process
-                return f"Started {program_name}"
+                command = self.program_index.command(program_name)
+                if command:
+                    process = self._launch(program_name, command)
+                    self.frecency.record(program_name, command[0])
+                    return self._started(program_name, process)
+
+                # Near misses are only suggested, never launched: a shortened or mistyped
+                # name (e.g. 'powerof', 'shutdwn') must not start a program on its own
+                if not any(c.isspace() for c in program_name):
+                    # Rank a wider set by use, so a program opened often beats a closer rare match
+                    matches = self.frecency.rank(self.program_index.snapshot.match(program_name, limit=20))[:5]
+                    if matches:
+                        return f"Program '{program_name}' not found. Did you mean: {', '.join(matches)}?"
+
+                # A command line: the first word is the program, the rest are its arguments
+                try:
+                    args = shlex.split(original)
+                except ValueError:
+                    args = original.split()
+                executable = self._resolve_executable(args[0]) if args else None
+                if executable:
+                    name = os.path.basename(args[0]).lower()
+                    process = self._launch(name, args)
+                    self.frecency.record(name, executable)
+                    return self._started(name, process)
+
+                return (f"Program '{program_name}' not found. "
+                        f"Use 'open --shell {program_name}' to run it through the shell")
             except Exception as e:
                 return f"Could not start {program_name}: {str(e)}"
             
         except Exception as e:
             return f"Error handling program: {str(e)}"
 
+    def open_many(self, targets):
+        """Open comma-separated targets and @profiles concurrently, reporting each with its timing"""
+        try:
+            targets = self._expand_targets(targets)
+        except KeyError as e:
+            return f"Unknown launch profile '{e.args[0]}'"
+        if not targets:
+            return "Usage: open <target>, <target>, ... or open @profile"
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(len(targets), MAX_PARALLEL_LAUNCHES)) as executor:
+            results = list(executor.map(self._timed_open, targets))
+        elapsed = time.perf_counter() - started
+
+        response = f"Opened {len(targets)} targets in {elapsed * 1000:.1f} ms:\n"
+        for target, (result, target_elapsed) in zip(targets, results):
+            response += f"- {target}: {result} [{target_elapsed * 1000:.1f} ms]\n"
+        return response
+
+    def _timed_open(self, target):
+        started = time.perf_counter()
+        result = self.open_program(target)
+        return result, time.perf_counter() - started
+
+    def _is_target_list(self, text):
+        """Whether 'open' text names several targets rather than one URL, workspace file or path"""
+        text = text.strip()
+        if text.startswith('@'):
+            return True
+        if ',' not in text:
+            return False
+        lowered = text.lower()
+        if lowered.startswith(('http://', 'https://', 'www.', 'workspace ')) or os.path.exists(text):
+            return False
+        return True
+
+    def _split_targets(self, text):
+        """Split a target list on ', ', or on bare commas if it has none, so 'a, b?x=1,2' keeps its URL"""
+        if re.search(r',\s', text):
+            return re.split(r',\s+', text)
+        return text.split(',')
+
+    def _expand_targets(self, text, targets=None, seen=None):
+        """Split a target list, replacing @profile references with the profile's targets"""
+        targets = [] if targets is None else targets
+        seen = set() if seen is None else seen
+        items = text if isinstance(text, list) else self._split_targets(text)
+        for target in items:
+            target = target.strip().rstrip(',')
+            if target.startswith('@'):
+                name = target[1:].lower()
+                if name not in self.launch_profiles:
+                    raise KeyError(name)
+                if name not in seen:
+                    seen.add(name)
+                    # Profiles store targets already split; expanding them never re-splits a target
+                    self._expand_targets(list(self.launch_profiles[name]), targets, seen)
+            elif target and target not in targets:
+                targets.append(target)
+        return targets
+
+    def manage_profile(self, args):
+        """Save or delete a launch profile: profile save <name> <target>, ..., profile delete <name>"""
+        parts = args.strip().split(None, 2)
+        if len(parts) == 3 and parts[0].lower() == 'save':
+            name = parts[1].lower().lstrip('@')
+            targets = [target.strip() for target in self._split_targets(parts[2]) if target.strip()]
+            self.launch_profiles[name] = targets
+            return f"Saved launch profile '{name}': {', '.join(targets)} ('open @{name}' to launch)"
+        if len(parts) == 2 and parts[0].lower() == 'delete':
+            name = parts[1].lower().lstrip('@')
+            if self.launch_profiles.pop(name, None) is None:
+                return f"Unknown launch profile '{name}'"
+            return f"Deleted launch profile '{name}'"
+        return "Usage: profile save <name> <target>, <target>, ... | profile delete <name>"
+
+    def list_profiles(self):
+        """List saved launch profiles"""
+        if not self.launch_profiles:
+            return "No launch profiles ('profile save <name> <target>, ...' to create one)"
+        return "Launch profiles:\n" + "\n".join(
+            f"- @{name}: {', '.join(targets)}" for name, targets in sorted(self.launch_profiles.items()))
+
     def _handle_file(self, file_path):
         """Handle different file types"""
         _, ext = os.path.splitext(file_path)
@@ -178,48 +371,152 @@ class ProgramManager:
         handler = self.file_handlers[ext]
         
         try:
-            if ext in ['.cpp', '.c']:
-                # Compile C/C++ files
-                output = file_path.rsplit('.', 1)[0] + '.exe'
-                args = [handler['cmd']] + handler['args']
-                args = [arg.format(output=output) for arg in args]
-                args.append(file_path)
-                
-                compile_process = subprocess.run(args, capture_output=True, text=True)
-                if compile_process.returncode != 0:
-                    return f"Compilation error: {compile_process.stderr}"
-                
-                process = subprocess.Popen([output])
-                self.running_processes[os.path.basename(output)] = process
-                return f"Compiled and running {os.path.basename(file_path)}"
-                
-            elif ext == '.java':
-                # Compile and run Java files
-                compile_process = subprocess.run([handler['cmd'], file_path], capture_output=True, text=True)
-                if compile_process.returncode != 0:
-                    return f"Compilation error: {compile_process.stderr}"
-                
-                class_file = file_path.rsplit('.', 1)[0]
-                process = subprocess.Popen(['java', os.path.basename(class_file)])
-                self.running_processes[os.path.basename(class_file)] = process
-                return f"Compiled and running {os.path.basename(file_path)}"
+            if ext in ['.cpp', '.c', '.java']:
+                # Without a way to report back later, build synchronously
+                if self.output_callback is None:
+                    try:
+                        return self._build_and_run(file_path, ext, handler)
+                    except JobFailed as e:
+                        return str(e)
+
+                job = self.jobs.submit(f"build {os.path.basename(file_path)}",
+                                       lambda job: self._build_and_run(file_path, ext, handler, job))
+                return f"Started job #{job.id}: build {os.path.basename(file_path)}"
                 
+            elif ext == '.py' and self.python_pool is not None:
+                name = os.path.basename(file_path)
+                process, output = self.python_pool.run(file_path)
+                name = self.process_supervisor.track(name, process).name
+                self.output_capture.attach(name, output)
+                return f"Running {name} (warm interpreter)"
+
             elif ext == '.exe':
                 # Direct execution for exe files
-                process = subprocess.Popen([file_path])
-                self.running_processes[os.path.basename(file_path)] = process
-                return f"Running {os.path.basename(file_path)}"
+                process = self._launch(os.path.basename(file_path), [file_path])
+                return f"Running {process.tracked_name}"
                 
             else:
                 # Handle other file types
                 cmd = [handler['cmd']] + handler['args'] + [file_path]
-                process = subprocess.Popen(cmd)
-                self.running_processes[os.path.basename(file_path)] = process
-                return f"Running {os.path.basename(file_path)}"
+                process = self._launch(os.path.basename(file_path), cmd)
+                return f"Running {process.tracked_name}"
                 
         except Exception as e:
             return f"Error handling file {file_path}: {str(e)}"
 
+    def _build_and_run(self, file_path, ext, handler, job=None):
+        """Compile a C, C++ or Java file (through the build cache) and launch the result"""
+        base_name = os.path.basename(file_path).rsplit('.', 1)[0]
+        output_name = base_name + '.exe' if ext in ['.cpp', '.c'] else ''
+        artifact_dir, cached = self._compile(file_path, handler, output_name, job)
+
+        if ext == '.java':
+            self._launch(base_name, [handler['run_cmd'], '-cp', artifact_dir, base_name])
+        else:
+            self._launch(output_name, [os.path.join(artifact_dir, output_name)])
+
+        verb = "Running cached build of" if cached else "Compiled and running"
+        return f"{verb} {os.path.basename(file_path)}"
+
+    def _compile(self, file_path, handler, output_name='', job=None):
+        """Compile a source file through the build cache.
+
+        Returns (artifact directory, whether it was a cache hit) and raises
+        JobFailed with the compiler output on errors. {output} and
+        {output_dir} in the handler args are filled in with the build
+        location. Inside a job the compiler can be cancelled.
+        """
+        key = self.build_cache.key(file_path, handler['cmd'], handler['args'])
+        artifact_dir = self.build_cache.lookup(key)
+        if artifact_dir:
+            return artifact_dir, True
+
+        build_dir = self.build_cache.begin(key)
+        output = os.path.join(build_dir, output_name)
+        args = [handler['cmd']] + [arg.format(output=output, output_dir=build_dir) for arg in handler['args']]
+        args.append(file_path)
+
+        try:
+            if job is None:
+                compile_process = subprocess.run(args, capture_output=True, text=True)
+            else:
+                self.jobs.progress(job, f"Compiling {os.path.basename(file_path)} with {handler['cmd']}...")
+                compile_process = self.jobs.run_process(job, args)
+        except BaseException:
+            self.build_cache.discard(build_dir)
+            raise
+        if compile_process.returncode != 0:
+            self.build_cache.discard(build_dir)
+            raise JobFailed(f"Compilation error: {compile_process.stderr}")
+        return self.build_cache.store(key, build_dir, file_path), False
+
+    def show_logs(self, args):
+        """Show or follow captured output: logs <program> [follow|stop|<lines>], logs stop"""
+        parts = args.strip().lower().split()
+        if not parts:
+            return "Usage: logs <program> [follow|stop]"
+        if parts == ['stop']:
+            return self.output_capture.unfollow()
+
+        # Program names may have spaces (e.g. 'text editor'); only the last word can be an option
+        option = parts[-1] if len(parts) > 1 else None
+        if option in ('follow', 'stop') or (option and option.isdigit()):
+            parts = parts[:-1]
+        name = ' '.join(parts)
+        if option == 'follow':
+            return self.output_capture.follow(name)
+        if option == 'stop':
+            return self.output_capture.unfollow(name)
+        count = int(option) if option and option.isdigit() else 50
+        return self.output_capture.tail(name, count)
+
+    def configure_python_pool(self, args):
+        """Enable, disable or inspect the warm Python pool: python pool [on|off|status]"""
+        action = args.strip().lower() or 'status'
+
+        if action == 'on':
+            if self.python_pool is not None:
+                return "Python pool is already on"
+            try:
+                self.python_pool = PythonPool(self._notify)
+            except Exception as e:
+                return f"Could not start the Python pool: {str(e)}"
+            return "Python pool enabled; workspace .py scripts run in warm interpreters"
+
+        if action == 'off':
+            if self.python_pool is None:
+                return "Python pool is already off"
+            self.python_pool.shutdown()
+            self.python_pool = None
+            return "Python pool disabled; scripts run in fresh interpreters"
+
+        if action == 'status':
+            if self.python_pool is None:
+                return "Python pool is off ('python pool on' to enable)"
+            return self.python_pool.status()
+
+        return "Usage: python pool [on|off|status]"
+
+    def list_jobs(self):
+        """List background build jobs"""
+        return self.jobs.list_jobs()
+
+    def cancel_job(self, job_id):
+        """Cancel a background job by number"""
+        try:
+            return self.jobs.cancel(int(job_id.strip().lstrip('#')))
+        except ValueError:
+            return "Usage: jobs cancel <job number>"
+
+    def build_cache_stats(self):
+        """Show build cache size and hit rate"""
+        return self.build_cache.stats()
+
+    def clear_build_cache(self):
+        """Remove all cached build artifacts"""
+        self.build_cache.clear()
+        return "Build cache cleared"
+
     def close_program(self, program_name):
         """Close a running program"""
         program_name = program_name.lower()
@@ -228,53 +525,193 @@ class ProgramManager:
         if program_name == 'all':
             if not self.running_processes:
                 return "No programs running"
-            
-            closed_programs = []
-            failed_programs = []
-            
-            for prog_name, process in list(self.running_processes.items()):
-                try:
-                    process.terminate()
-                    process.wait(timeout=5)
-                    del self.running_processes[prog_name]
-                    closed_programs.append(prog_name)
-                except Exception:
-                    failed_programs.append(prog_name)
-            
-            response = f"Closed programs: {', '.join(closed_programs)}" if closed_programs else ""
-            if failed_programs:
-                response += f"\nFailed to close: {', '.join(failed_programs)}"
-            return response
+
+            # Without a way to report back later, close synchronously
+            if self.output_callback is None:
+                return self._close_all()
+
+            Thread(target=lambda: self._notify(self._close_all()), daemon=True).start()
+            return f"Closing {len(self.running_processes)} programs..."
         
         if program_name not in self.running_processes:
             return f"Program '{program_name}' is not running"
             
         try:
             process = self.running_processes[program_name]
-            process.terminate()
-            process.wait(timeout=5)
-            del self.running_processes[program_name]
-            return f"Closed {program_name}"
+            outcome = self._close_trees([(program_name, process)])[program_name]
+            if process.returncode is None:
+                return f"Error closing {program_name}: {outcome}"
+            return f"Closed {program_name}: {outcome}"
         except Exception as e:
             return f"Error closing {program_name}: {str(e)}"
 
+    def _close_all(self):
+        """Close every running program and report each outcome"""
+        targets = list(self.running_processes.items())
+        outcomes = self._close_trees(targets)
+        return "Close all:\n" + "\n".join(f"- {name}: {outcomes[name]}" for name, _ in targets)
+
+    def _close_trees(self, targets, timeout=5, kill_timeout=2):
+        """Terminate the process trees of all targets at once, then kill whatever outlives a shared deadline"""
+        supervisor = self.process_supervisor
+        outcomes = {}
+        members = {}
+
+        for name, process in targets:
+            try:
+                members[name] = supervisor.signal_tree(process)
+            except Exception as e:
+                outcomes[name] = f"failed to terminate: {str(e)}"
+
+        deadline = time.monotonic() + timeout
+        stragglers = []
+        for name, process in targets:
+            if name in outcomes:
+                continue
+            exited = supervisor.wait(process, max(0, deadline - time.monotonic()))
+            members[name] = supervisor.wait_members(members[name], max(0, deadline - time.monotonic()))
+            if exited and not members[name]:
+                outcomes[name] = f"closed (exit code {process.returncode})"
+            else:
+                stragglers.append((name, process))
+
+        for name, process in stragglers:
+            if process.returncode is None:
+                supervisor.signal_tree(process, kill=True)
+            for member in members[name]:
+                try:
+                    member.kill()
+                except psutil.Error:
+                    pass
+
+        deadline = time.monotonic() + kill_timeout
+        for name, process in stragglers:
+            exited = supervisor.wait(process, max(0, deadline - time.monotonic()))
+            alive = supervisor.wait_members(members[name], max(0, deadline - time.monotonic()))
+            if exited and not alive:
+                outcomes[name] = f"killed after {timeout}s"
+            else:
+                outcomes[name] = "still running after kill"
+
+        return outcomes
+
+    def _launch(self, name, args, shell=False):
+        """Start a program, track it under name and capture its output.
+
+        Outside shell mode the executable is resolved through the program
+        index (or PATH) and started with posix_spawn where available, so
+        no shell runs and the tracked pid is the program itself.
+        """
+        started = time.perf_counter()
+        if shell or not fast_spawn.AVAILABLE:
+            process = self._popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, shell=shell)
+        else:
+            executable = self._resolve_executable(args[0])
+            if executable is None:
+                raise FileNotFoundError(f"'{args[0]}' not found")
+            process = fast_spawn.spawn(executable, args)
+        # Seconds from the launch request until the process was running
+        process.launch_latency = time.perf_counter() - started
+        # Unique among running programs, e.g. 'sleep#2' while another sleep runs
+        process.tracked_name = self.process_supervisor.track(name, process).name
+        self.output_capture.attach(process.tracked_name, process.stdout)
+        return process
+
+    def _resolve_executable(self, command):
+        """Full path of a command, looked up in the program index and then PATH"""
+        if os.sep in command or (os.altsep and os.altsep in command):
+            return command if os.path.isfile(command) else None
+        return self.program_index.resolve(command) or shutil.which(command)
+
+    def _started(self, name, process):
+        """Launch confirmation with the pid and how long the launch took"""
+        name = getattr(process, 'tracked_name', name)
+        latency = getattr(process, 'launch_latency', None)
+        latency = f", {latency * 1000:.1f} ms" if latency is not None else ""
+        return f"Started {name} (pid {process.pid}{latency})"
+
+    def _popen(self, args, **kwargs):
+        """Start a program in its own process group so its whole tree can be closed together"""
+        if platform.system() == 'Windows':
+            kwargs.setdefault('creationflags', subprocess.CREATE_NEW_PROCESS_GROUP)
+        else:
+            kwargs.setdefault('start_new_session', True)
+        return subprocess.Popen(args, **kwargs)
+
+    def _notify(self, message):
+        """Deliver a message produced after the command that started it has returned"""
+        if self.output_callback:
+            self.output_callback(message)
+
     def list_running_programs(self):
         """List all programs started by the bot"""
         if not self.running_processes:
             return "No programs running"
-            
-        return "Running programs:\n" + "\n".join(f"- {name}" for name in self.running_processes.keys())
+
+        now = time.time()
+        # Resource use comes from the monitor's latest sample rather than a second walk of each tree
+        samples = {row[0]: row for row in self.process_monitor.rows}
+        response = "Running programs:\n"
+        for name, process in list(self.running_processes.items()):
+            record = self.process_supervisor.record_for(process)
+            uptime = f", up {self._format_duration(now - record.started)}" if record else ""
+            if getattr(process, 'launch_latency', None) is not None:
+                uptime += f", launched in {process.launch_latency * 1000:.1f} ms"
+            row = samples.get(name)
+            if row is None or row[1] != process.pid:
+                response += f"- {name} (pid {process.pid}{uptime}): not sampled yet\n"
+                continue
+            _, _, count, cpu, rss = row[:5]
+            response += (f"- {name} (pid {process.pid}{uptime}): {count} processes, "
+                         f"CPU {cpu:.1f}%, RSS {format_bytes(rss)}\n")
+        return response
+
+    def show_top(self):
+        """Latest resource sample of every launched program, busiest first"""
+        rows = sorted(self.process_monitor.rows, key=lambda row: (-row[3], -row[4]))
+        if not rows:
+            return "No programs running" if not self.running_processes else "Sampling programs... try again in a moment"
+
+        response = f"Top ({self.process_monitor.interval:g}s samples):\n"
+        for name, pid, processes, cpu, rss, threads, read_rate, write_rate, history in rows:
+            io = (f", IO read {format_bytes(read_rate)}/s write {format_bytes(write_rate)}/s"
+                  if read_rate is not None else "")
+            response += (f"- {name} (pid {pid}): CPU {cpu:.1f}% {history}, RSS {format_bytes(rss)}, "
+                         f"{processes} processes, {threads} threads{io}\n")
+        return response
+
+    def list_exited_programs(self):
+        """List recently exited programs with exit code, runtime and peak memory"""
+        if not self.process_supervisor.history:
+            return "No programs have exited yet"
+
+        response = "Recently exited programs:\n"
+        for record in reversed(self.process_supervisor.history):
+            peak = format_bytes(record.peak_rss) if record.peak_rss is not None else "n/a"
+            code = record.returncode if record.returncode is not None else "unknown"
+            response += (f"- {record.name} (pid {record.pid}): exit code {code}, "
+                         f"ran {self._format_duration(record.runtime)}, peak RSS {peak}\n")
+        return response
 
     def list_available_programs(self):
         """List all detected programs"""
+        progress = self.program_index.scan_progress()
         if not self.program_paths:
+            if progress:
+                return f"Scanning programs... {progress[0]}/{progress[1]} directories"
             return "No programs detected"
             
         response = "Available Programs:\n"
-        sorted_programs = sorted(self.program_paths.keys())
-        
+        if progress:
+            response += f"Rescanning: {progress[0]}/{progress[1]} directories\n"
+        response += (f"Index cache hits: {self.program_index.cache_hits}, "
+                     f"misses: {self.program_index.cache_misses}\n")
+
+        frequent = [name for name, _ in self.frecency.top(PRERESOLVE_COUNT) if name in self.program_paths][:10]
+        if frequent:
+            response += "\nFrequently used:\n" + "".join(f"- {name}\n" for name in frequent)
         current_letter = ''
-        for program in sorted_programs:
+        for program in self.program_index.snapshot.names:
             first_letter = program[0].upper()
             if first_letter != current_letter:
                 current_letter = first_letter
@@ -284,50 +721,97 @@ class ProgramManager:
         return response 
 
     def get_system_info(self):
-        """Get system information in a neofetch-like format"""
-        if platform.system() == 'Linux':
-            try:
-                return subprocess.check_output(['neofetch']).decode()
-            except:
-                pass
-        
-        # Get system information
+        """Get system information in a neofetch-like format, from the background sampler's latest snapshot"""
+        snapshot = self.system_sampler.snapshot()
+        if snapshot is None:
+            return "Collecting system information... try again in a moment"
+        static, sample, age = snapshot
+
         info = {
-            'OS': f"{platform.system()} {platform.release()}",
-            'Host': platform.node(),
-            'Kernel': platform.version(),
-            'Uptime': self._get_uptime(),
-            'Shell': os.environ.get('SHELL', os.environ.get('COMSPEC', '')),
-            'CPU': platform.processor(),
-            'Memory': self._get_memory_info(),
-            'Disk': self._get_disk_info(),
+            'OS': static['os'],
+            'Host': static['host'],
+            'Kernel': static['kernel'],
+            'Uptime': self._format_duration(sample['time'] - static['boot_time']),
+            'Shell': static['shell'],
+            'CPU': f"{static['cpu']} ({static['cores']} cores, {static['threads']} threads)",
+            'CPU Usage': f"{sample['cpu_percent']:.1f}%",
+            'Memory': (f"Total: {format_bytes(static['memory_total'])} | "
+                       f"Used: {format_bytes(sample['memory_used'])} ({sample['memory_percent']}%)"),
+            'Processes': sample['processes'],
         }
-        
+        if sample['load'] is not None:
+            info['Load'] = " ".join(f"{value:.2f}" for value in sample['load'])
+        if sample['swap_total']:
+            info['Swap'] = f"Total: {format_bytes(sample['swap_total'])} | Used: {format_bytes(sample['swap_used'])}"
+        if sample['disk_total'] is not None:
+            info['Disk'] = (f"Total: {format_bytes(sample['disk_total'])} | "
+                            f"Used: {format_bytes(sample['disk_used'])} ({sample['disk_percent']}%)")
+
         # Format the output
-        return "\n".join(f"{k}: {v}" for k, v in info.items())
+        return "\n".join(f"{k}: {v}" for k, v in info.items()) + f"\n(sampled {age:.1f}s ago)"
 
-    def _get_uptime(self):
-        """Get system uptime"""
-        if platform.system() == 'Windows':
-            return str(timedelta(seconds=int(time.time() - psutil.boot_time())))
-        return ""
-
-    def _get_memory_info(self):
-        """Get memory information"""
-        mem = psutil.virtual_memory()
-        return f"Total: {self._format_bytes(mem.total)} | Used: {self._format_bytes(mem.used)} ({mem.percent}%)"
-
-    def _get_disk_info(self):
-        """Get disk information"""
-        disk = psutil.disk_usage('/')
-        return f"Total: {self._format_bytes(disk.total)} | Used: {self._format_bytes(disk.used)} ({disk.percent}%)"
-
-    def _format_bytes(self, bytes):
-        """Format bytes to human readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes < 1024:
-                return f"{bytes:.1f}{unit}"
-            bytes /= 1024
+    def system_history(self, args):
+        """Record or summarize system metrics history: system history [on|off|<window>]"""
+        action = args.strip().lower() or '1h'
+
+        if action == 'on':
+            if self.metrics_recorder is not None:
+                return "System history is already being recorded"
+            try:
+                self.metrics_recorder = MetricsRecorder(self.system_sampler)
+            except Exception as e:
+                return f"Could not start recording system history: {str(e)}"
+            ring = self.metrics_recorder.ring
+            return (f"Recording system history every {self.metrics_recorder.interval}s "
+                    f"({self._format_duration(ring.capacity * self.metrics_recorder.interval)} "
+                    f"in {format_bytes(ring.size())})")
+
+        if action == 'off':
+            if self.metrics_recorder is None:
+                return "System history is not being recorded"
+            self.metrics_recorder.stop()
+            self.metrics_recorder = None
+            return "Stopped recording system history"
+
+        match = re.match(r'^(\d+)\s*([smhd]?)$', action)
+        if not match:
+            return "Usage: system history [on|off|<window>], e.g. system history 30m"
+        window = int(match.group(1)) * {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400}[match.group(2)]
+
+        try:
+            if self.metrics_recorder is not None:
+                summary = self.metrics_recorder.ring.summary(window)
+            elif os.path.exists(METRICS_FILE):
+                ring = MetricsRing(METRICS_FILE, create=False)
+                summary = ring.summary(window)
+                ring.close()
+            else:
+                return "No system history recorded yet ('system history on' to start)"
+        except Exception as e:
+            return f"Error reading system history: {str(e)}"
+
+        count, oldest, stats = summary
+        if not count:
+            return f"No system history in the last {self._format_duration(window)}"
+        response = (f"System history, last {self._format_duration(window)} "
+                    f"({count} samples since {time.strftime('%Y-%m-%d %H:%M', time.localtime(oldest))}):\n")
+        for field, (low, average, high) in zip(FIELDS, stats):
+            if field == 'Load':
+                response += f"{field}: min {low:.2f}, avg {average:.2f}, max {high:.2f}\n"
+            else:
+                response += f"{field}: min {low:.1f}%, avg {average:.1f}%, max {high:.1f}%\n"
+        if self.metrics_recorder is None:
+            response += "(not recording; 'system history on' to resume)\n"
+        return response
+
+    def _format_duration(self, seconds):
+        """Format a duration in seconds to a short human readable form"""
+        seconds = int(seconds)
+        if seconds < 60:
+            return f"{seconds}s"
+        if seconds < 3600:
+            return f"{seconds // 60}m {seconds % 60}s"
+        return f"{seconds // 3600}h {seconds % 3600 // 60}m"
 
     def get_window_size(self):
         """Get terminal window size"""
@@ -0,0 +1,120 @@
+import heapq
+import re
+from bisect import bisect_left
+
+# Sorts after every character a program name can contain
+_PREFIX_END = '\U0010ffff'
+
+# Longest query the edit-distance fallback is attempted for
+MAX_TYPO_QUERY = 24
+
+
+def prefix_matches(names, prefix, limit=None):
+    """Names starting with prefix, found by bisecting the sorted name list"""
+    start = bisect_left(names, prefix)
+    end = bisect_left(names, prefix + _PREFIX_END, start)
+    if limit is not None:
+        end = min(end, start + limit)
+    return names[start:end]
+
+
+def fuzzy_matches(names, blob, query, limit=10):
+    """Rank names against query, best first.
+
+    Matches are gathered in tiers and the search stops as soon as a tier
+    fills the limit: prefix matches (bisect), substring matches (str.find
+    over the newline-joined names), then in-order subsequence matches and
+    names within a small edit distance. The last two tiers only consider
+    names sharing the query's first character, which keeps them to a small
+    bisected slice of the index.
+    """
+    if not query or '\n' in query:
+        return []
+
+    results = []
+    seen = set()
+
+    def take(candidates):
+        for name in candidates:
+            if name not in seen:
+                seen.add(name)
+                results.append(name)
+                if len(results) >= limit:
+                    return True
+        return False
+
+    if take(heapq.nsmallest(limit, prefix_matches(names, query), key=lambda n: (len(n), n))):
+        return results
+
+    if take(heapq.nsmallest(limit, _substring_matches(blob, query), key=lambda n: (len(n), n))):
+        return results
+
+    bucket = prefix_matches(names, query[0])
+    if not bucket:
+        return results
+
+    # [^\nc]*c never backtracks, so this pass stays linear in the bucket size
+    subsequence = re.compile(
+        '^' + ''.join(r'[^\n' + e + ']*' + e for e in map(re.escape, query)) + r'[^\n]*$',
+        re.MULTILINE)
+    candidates = subsequence.findall('\n'.join(bucket))
+    candidates.sort(key=lambda n: (_spread(n, query), len(n), n))
+    if take(candidates) or results or len(query) > MAX_TYPO_QUERY:
+        return results
+
+    max_distance = 1 if len(query) <= 4 else 2
+    typos = []
+    for name in bucket:
+        # Every query character missing from name costs at least one edit
+        if abs(len(name) - len(query)) > max_distance:
+            continue
+        if sum(c not in name for c in query) > max_distance:
+            continue
+        distance = bounded_edit_distance(query, name, max_distance)
+        if distance is not None:
+            typos.append((distance, len(name), name))
+    typos.sort()
+    return [name for _, _, name in typos[:limit]]
+
+
+def _substring_matches(blob, query):
+    """Lines of the newline-joined name blob that contain query"""
+    matches = []
+    position = blob.find(query)
+    while position != -1:
+        start = blob.rfind('\n', 0, position) + 1
+        end = blob.find('\n', position)
+        if end == -1:
+            end = len(blob)
+        matches.append(blob[start:end])
+        position = blob.find(query, end)
+    return matches
+
+
+def bounded_edit_distance(a, b, max_distance):
+    """Levenshtein distance between a and b, or None once it must exceed max_distance"""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = previous[j - 1] + (ca != cb)
+            cost = min(cost, previous[j] + 1, current[j - 1] + 1)
+            current.append(cost)
+            row_min = min(row_min, cost)
+        if row_min > max_distance:
+            return None
+        previous = current
+
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+def _spread(name, query):
+    """Span covered by the leftmost in-order match of query in name (tighter is better)"""
+    start = position = name.find(query[0])
+    for c in query[1:]:
+        position = name.find(c, position + 1)
+    return position - start
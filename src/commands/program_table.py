@@ -0,0 +1,139 @@
+import os
+import sys
+from array import array
+from collections.abc import Mapping
+
+# Directory index of names that have no path in the table (or an unusual one)
+NO_DIRECTORY = 0xFFFF
+
+
+class NameArray:
+    """Sorted names packed into one newline-joined string plus start offsets.
+
+    Supports len(), indexing, slicing and iteration, so it can be bisected
+    like a list, while costing about one byte per character and four per
+    name instead of a separate str object per name. The joined string
+    doubles as the blob the substring matcher searches.
+    """
+
+    def __init__(self, names):
+        self.blob = '\n'.join(names)
+        self._offsets = array('I')
+        position = 0
+        for name in names:
+            self._offsets.append(position)
+            position += len(name) + 1
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            # One split of the covered part of the blob instead of a slice per name
+            end = self._offsets[stop] - 1 if stop < len(self._offsets) else len(self.blob)
+            return self.blob[self._offsets[start]:end].split('\n')
+        count = len(self._offsets)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError('name index out of range')
+        end = self._offsets[index + 1] - 1 if index + 1 < count else len(self.blob)
+        return self.blob[self._offsets[index]:end]
+
+    def __iter__(self):
+        return iter(self.blob.split('\n') if self._offsets else [])
+
+    def index(self, name):
+        """Position of name, or -1 if it is not present"""
+        # Inlined binary search: compares slices of the blob without going through __getitem__
+        blob = self.blob
+        offsets = self._offsets
+        count = len(offsets)
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            end = offsets[middle + 1] - 1 if middle + 1 < count else len(blob)
+            candidate = blob[offsets[middle]:end]
+            if candidate < name:
+                low = middle + 1
+            elif candidate > name:
+                high = middle
+            else:
+                return middle
+        return -1
+
+
+class ProgramTable(Mapping):
+    """Read-only name -> path mapping stored as directory indices.
+
+    Each distinct directory is stored once, interned; every name in the
+    shared NameArray gets a 16-bit index into that table, or NO_DIRECTORY
+    when it has no executable. Paths are joined on lookup. The rare paths
+    that are not simply directory/name (for example names that were
+    lowercased) are kept verbatim in a small side dict.
+    """
+
+    def __init__(self, names, programs):
+        self.names = names
+        self.directories = []
+        self._indices = array('H')
+        self._other = {}
+        directory_ids = {}
+
+        for name in names:
+            path = programs.get(name)
+            if path is None:
+                self._indices.append(NO_DIRECTORY)
+                continue
+            directory, base = os.path.split(path)
+            directory_id = directory_ids.get(directory)
+            if directory_id is None and len(self.directories) < NO_DIRECTORY:
+                directory_id = directory_ids[directory] = len(self.directories)
+                self.directories.append(sys.intern(directory))
+            if base != name or directory_id is None:
+                self._other[name] = path
+                self._indices.append(NO_DIRECTORY)
+            else:
+                self._indices.append(directory_id)
+        self._count = len(self._indices) - self._indices.count(NO_DIRECTORY) + len(self._other)
+
+    def __getitem__(self, name):
+        path = self._other.get(name)
+        if path is not None:
+            return path
+        position = self.names.index(name)
+        if position < 0 or self._indices[position] == NO_DIRECTORY:
+            raise KeyError(name)
+        return os.path.join(self.directories[self._indices[position]], name)
+
+    def __contains__(self, name):
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for name, _ in self.items():
+            yield name
+
+    def items(self):
+        """(name, path) pairs in name order, without a bisect per name"""
+        directories = self.directories
+        for name, directory_id in zip(self.names, self._indices):
+            if directory_id != NO_DIRECTORY:
+                yield name, os.path.join(directories[directory_id], name)
+            elif name in self._other:
+                yield name, self._other[name]
+
+    def to_dict(self):
+        """A plain dict copy, for building the next snapshot"""
+        return dict(self.items())
@@ -0,0 +1,176 @@
+import os
+import sys
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+from threading import Thread, Event
+
+# inotify event masks (see <sys/inotify.h>)
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class ProgramWatcher:
+    """Keeps a ProgramIndex current by watching its directories.
+
+    Uses inotify where available and falls back to polling directory
+    mtimes. Events are coalesced: a batch is applied once the directories
+    have been quiet for quiet_period seconds, or after max_delay seconds of
+    continuous activity, so a package manager installing hundreds of
+    binaries produces a single index update.
+    """
+
+    def __init__(self, index, quiet_period=0.3, max_delay=2.0, poll_interval=5.0):
+        self.index = index
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.mode = None
+        self._pending = {}
+        self._first_event = None
+        self._last_event = None
+        self._stop = Event()
+        self._thread = None
+
+    def start(self):
+        """Start watching in a background thread"""
+        if self._thread is None:
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop watching; pending changes are discarded"""
+        self._stop.set()
+
+    def _run(self):
+        fd = self._init_inotify()
+        if fd is None:
+            self.mode = 'polling'
+            self._run_polling()
+        else:
+            self.mode = 'inotify'
+            try:
+                self._run_inotify(fd)
+            finally:
+                os.close(fd)
+
+    def _init_inotify(self):
+        """Set up inotify watches through libc, or return None if unavailable"""
+        if not sys.platform.startswith('linux'):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+
+        self._watches = {}
+        for directory in self.index.directories:
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK)
+            if wd >= 0:
+                self._watches[wd] = directory
+
+        if not self._watches:
+            os.close(fd)
+            return None
+        return fd
+
+    def _run_inotify(self, fd):
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([fd], [], [], self._timeout(1.0))
+            except (OSError, ValueError):
+                return
+            if ready:
+                self._read_events(fd)
+            self._flush_if_due()
+
+    def _read_events(self, fd):
+        """Drain the inotify queue into the pending batch"""
+        while True:
+            try:
+                data = os.read(fd, 64 * 1024)
+            except OSError:
+                # EAGAIN: the queue is drained
+                return
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    # The kernel dropped events; revalidate every directory
+                    for directory in self._watches.values():
+                        self._add_pending(directory, None)
+                    continue
+
+                directory = self._watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    self._add_pending(directory, None)
+                elif name:
+                    self._add_pending(directory, name)
+
+    def _run_polling(self):
+        while not self._stop.wait(self.poll_interval):
+            for directory in self.index.stale_directories():
+                self._add_pending(directory, None)
+            # A poll interval already coalesces bursts, so apply right away
+            self._flush()
+
+    def _add_pending(self, directory, name):
+        now = time.monotonic()
+        if self._first_event is None:
+            self._first_event = now
+        self._last_event = now
+
+        if name is None:
+            self._pending[directory] = None
+        elif directory not in self._pending:
+            self._pending[directory] = {name}
+        elif self._pending[directory] is not None:
+            self._pending[directory].add(name)
+
+    def _timeout(self, idle):
+        """Seconds until the pending batch is due, or idle when nothing is pending"""
+        if not self._pending:
+            return idle
+        due = min(self._last_event + self.quiet_period, self._first_event + self.max_delay)
+        return max(0.0, due - time.monotonic())
+
+    def _flush_if_due(self):
+        if self._pending and self._timeout(0) == 0:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        changes = self._pending
+        self._pending = {}
+        self._first_event = None
+        self._last_event = None
+        try:
+            self.index.apply_changes(changes)
+        except Exception:
+            pass
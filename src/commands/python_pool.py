@@ -0,0 +1,295 @@
+import os
+import sys
+import json
+import runpy
+import select
+import signal
+import socket
+import subprocess
+import traceback
+from threading import Thread, Lock, Event
+
+# Imported once by the fork server so every script starts with them loaded
+DEFAULT_PRELOAD = [
+    'collections', 'datetime', 'json', 'math', 'pathlib', 're', 'random',
+    'subprocess', 'threading', 'time', 'urllib.request',
+]
+# Seconds a script may run before it is terminated
+DEFAULT_TIMEOUT = 600
+# Seconds between SIGTERM and SIGKILL for a script that timed out
+KILL_GRACE = 2
+# Seconds to wait for the fork server to start a script
+START_TIMEOUT = 5
+
+
+class PoolProcess:
+    """Popen-like handle for a script running in a forked warm interpreter.
+
+    The script is a child of the fork server, not of the bot, so its exit
+    status arrives as a message from the server rather than from wait().
+    """
+
+    def __init__(self, pid, script):
+        self.pid = pid
+        self.script = script
+        self.returncode = None
+        self.timed_out = False
+        self.exited = Event()
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        if not self.exited.wait(timeout):
+            raise subprocess.TimeoutExpired(self.script, timeout)
+        return self.returncode
+
+    def terminate(self):
+        os.kill(self.pid, signal.SIGTERM)
+
+    def kill(self):
+        os.kill(self.pid, signal.SIGKILL)
+
+
+class PythonPool:
+    """Runs workspace Python scripts in warm interpreters.
+
+    A long-lived fork server imports DEFAULT_PRELOAD once, then forks a
+    fresh child for every script. Each child gets its own __main__,
+    session and stdout/stderr pipe, so runs are isolated from each other
+    while skipping interpreter startup and the preloaded imports.
+    """
+
+    def __init__(self, notify, timeout=DEFAULT_TIMEOUT, preload=DEFAULT_PRELOAD):
+        if not hasattr(os, 'fork') or getattr(sys, 'frozen', False):
+            raise RuntimeError("the Python pool needs os.fork and a Python interpreter")
+        self.notify = notify
+        self.timeout = timeout
+        self.runs = 0
+        self.running = {}
+        self._requests = {}
+        self._next_id = 1
+        self._lock = Lock()
+
+        self._socket, server_socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        # The server exits when its stdin closes, i.e. when the bot goes away
+        self._server = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), str(server_socket.fileno())] + list(preload),
+            stdin=subprocess.PIPE, pass_fds=[server_socket.fileno()], start_new_session=True)
+        server_socket.close()
+        Thread(target=self._read_messages, daemon=True).start()
+
+    def run(self, script, args=()):
+        """Run a script in a warm interpreter; returns (PoolProcess, output stream)"""
+        script = os.path.abspath(script)
+        output_read, output_write = os.pipe()
+        with self._lock:
+            request_id = self._next_id
+            self._next_id += 1
+            request = self._requests[request_id] = {'ready': Event(), 'script': os.path.basename(script)}
+
+        try:
+            message = json.dumps({'id': request_id, 'script': script, 'args': list(args), 'cwd': os.getcwd()})
+            socket.send_fds(self._socket, [message.encode()], [output_write])
+        except OSError:
+            os.close(output_read)
+            raise RuntimeError("the Python pool server is not running")
+        finally:
+            os.close(output_write)
+
+        if not request['ready'].wait(START_TIMEOUT) or 'handle' not in request:
+            os.close(output_read)
+            self._requests.pop(request_id, None)
+            raise RuntimeError(request.get('error', "the Python pool server did not respond"))
+
+        handle = request['handle']
+        self.runs += 1
+        if self.timeout:
+            Thread(target=self._watchdog, args=(handle, self.timeout), daemon=True).start()
+        return handle, os.fdopen(output_read, 'rb')
+
+    def status(self):
+        """Summary of the pool state"""
+        state = "running" if self._server.poll() is None else "stopped"
+        return (f"Python pool: fork server {state} (pid {self._server.pid}), "
+                f"{len(self.running)} scripts running, {self.runs} run, timeout {self.timeout}s")
+
+    def shutdown(self):
+        """Stop the fork server; scripts already running are left alone but no longer tracked"""
+        try:
+            self._server.stdin.close()
+            self._server.wait(1)
+        except (OSError, subprocess.TimeoutExpired):
+            self._server.kill()
+        # A datagram socket sees no EOF when its peer exits; wake _read_messages explicitly
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+
+    def _read_messages(self):
+        """Dispatch start replies and exit notices from the fork server"""
+        try:
+            self._dispatch_messages()
+        finally:
+            # No more exit notices can arrive; stop waiting for the scripts that are left
+            for handle in list(self.running.values()):
+                handle.exited.set()
+            self.running.clear()
+
+    def _dispatch_messages(self):
+        while True:
+            try:
+                data = self._socket.recv(4096)
+            except OSError:
+                return
+            if not data:
+                return
+            message = json.loads(data)
+
+            if 'exit' in message:
+                handle = self.running.pop(message['pid'], None)
+                if handle is not None:
+                    handle.returncode = message['exit']
+                    handle.exited.set()
+                continue
+
+            request = self._requests.pop(message['id'], None)
+            if request is None:
+                continue
+            if 'pid' in message:
+                handle = PoolProcess(message['pid'], request['script'])
+                self.running[handle.pid] = handle
+                request['handle'] = handle
+            else:
+                request['error'] = message.get('error', "unknown error")
+            request['ready'].set()
+
+    def _watchdog(self, handle, timeout):
+        if handle.exited.wait(timeout):
+            return
+        handle.timed_out = True
+        _signal_group(handle.pid, signal.SIGTERM)
+        if not handle.exited.wait(KILL_GRACE):
+            _signal_group(handle.pid, signal.SIGKILL)
+        self.notify(f"{handle.script} timed out after {timeout}s and was stopped")
+
+
+def _signal_group(pid, sig):
+    try:
+        os.killpg(pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _serve(sock, preload):
+    """Fork server main loop: fork a child per request and report child exits"""
+    # runpy.run_path imports pkgutil on first use; do it once here, not in every child
+    for module in ['pkgutil'] + preload:
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+    wake_read, wake_write = os.pipe()
+    os.set_blocking(wake_read, False)
+    os.set_blocking(wake_write, False)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    signal.set_wakeup_fd(wake_write)
+
+    while True:
+        try:
+            ready, _, _ = select.select([sock, sys.stdin, wake_read], [], [])
+        except InterruptedError:
+            continue
+
+        if sys.stdin in ready and not os.read(sys.stdin.fileno(), 1):
+            return
+        if wake_read in ready:
+            try:
+                while os.read(wake_read, 512):
+                    pass
+            except BlockingIOError:
+                pass
+            _report_exits(sock)
+        if sock in ready:
+            data, fds, _, _ = socket.recv_fds(sock, 65536, 1)
+            if not data:
+                return
+            request = json.loads(data)
+            try:
+                pid = os.fork()
+            except OSError as e:
+                sock.send(json.dumps({'id': request['id'], 'error': str(e)}).encode())
+                for fd in fds:
+                    os.close(fd)
+                continue
+            if pid == 0:
+                signal.set_wakeup_fd(-1)
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                os.close(wake_read)
+                os.close(wake_write)
+                sock.close()
+                _run_script(request, fds[0])
+            for fd in fds:
+                os.close(fd)
+            sock.send(json.dumps({'id': request['id'], 'pid': pid}).encode())
+
+
+def _report_exits(sock):
+    while True:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        sock.send(json.dumps({'pid': pid, 'exit': os.waitstatus_to_exitcode(status)}).encode())
+
+
+def _run_script(request, output):
+    """Forked child: run one script as __main__ with its output on the pipe, then exit"""
+    # Same process layout as a launched program: own session, output on the pipe
+    os.setsid()
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(output, 1)
+    os.dup2(output, 2)
+    os.close(devnull)
+    os.close(output)
+    sys.stdin = open(0, 'r', closefd=False)
+    sys.stdout = open(1, 'w', buffering=1, closefd=False)
+    sys.stderr = open(2, 'w', buffering=1, closefd=False)
+
+    code = 0
+    try:
+        os.chdir(request['cwd'])
+        sys.argv = [request['script']] + request['args']
+        sys.path[0] = os.path.dirname(request['script'])
+        runpy.run_path(request['script'], run_name='__main__')
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException as e:
+        # Report the traceback from the script's first frame, as a plain interpreter would
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != request['script']:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb or e.__traceback__)
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+if __name__ == '__main__':
+    _serve(socket.socket(fileno=int(sys.argv[1])), sys.argv[2:])
@@ -0,0 +1,121 @@
+import os
+import time
+import platform
+import psutil
+from threading import Thread, Event, Lock
+
+# Seconds between samples of the volatile metrics
+SAMPLE_INTERVAL = 2.0
+
+
+class SystemSampler:
+    """Keeps a recent snapshot of system information in a background thread.
+
+    Facts that cannot change while the bot runs (OS, CPU model, totals,
+    boot time) are collected once; memory, disk, CPU load and uptime are
+    re-sampled every interval seconds. Readers get the latest snapshot
+    without doing any work themselves.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.static = None
+        self.sample = None
+        self.sampled_at = None
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling in a background thread"""
+        if self._thread is None:
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def snapshot(self):
+        """(static facts, latest sample, age in seconds), or None before the first sample"""
+        with self._lock:
+            if self.sample is None:
+                return None
+            return self.static, self.sample, time.monotonic() - self.sampled_at
+
+    def _run(self):
+        static = self._collect_static()
+        # Prime cpu_percent so the first real sample measures a full interval
+        psutil.cpu_percent(None)
+        with self._lock:
+            self.static = static
+        while True:
+            sample = self._collect_sample()
+            with self._lock:
+                self.sample = sample
+                self.sampled_at = time.monotonic()
+            if self._stop.wait(self.interval):
+                return
+
+    def _collect_static(self):
+        memory = psutil.virtual_memory()
+        return {
+            'os': _os_name(),
+            'host': platform.node(),
+            'kernel': platform.release(),
+            'shell': os.environ.get('SHELL', os.environ.get('COMSPEC', '')),
+            'cpu': _cpu_model(),
+            'cores': psutil.cpu_count(logical=False) or 0,
+            'threads': psutil.cpu_count() or 0,
+            'memory_total': memory.total,
+            'boot_time': psutil.boot_time(),
+        }
+
+    def _collect_sample(self):
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        try:
+            disk = psutil.disk_usage(os.path.abspath(os.sep))
+        except OSError:
+            disk = None
+        try:
+            load = os.getloadavg()
+        except (AttributeError, OSError):
+            load = None
+        return {
+            'time': time.time(),
+            'cpu_percent': psutil.cpu_percent(None),
+            'load': load,
+            'memory_used': memory.used,
+            'memory_percent': memory.percent,
+            'swap_used': swap.used,
+            'swap_total': swap.total,
+            'disk_used': disk.used if disk else None,
+            'disk_total': disk.total if disk else None,
+            'disk_percent': disk.percent if disk else None,
+            'processes': len(psutil.pids()),
+        }
+
+
+def _os_name():
+    """Distribution name on Linux, system and release elsewhere"""
+    if platform.system() == 'Linux':
+        try:
+            return platform.freedesktop_os_release().get('PRETTY_NAME', 'Linux')
+        except OSError:
+            return 'Linux'
+    if platform.system() == 'Darwin':
+        return f"macOS {platform.mac_ver()[0]}"
+    return f"{platform.system()} {platform.release()}"
+
+
+def _cpu_model():
+    """CPU model name; platform.processor() is often empty on Linux"""
+    if platform.system() == 'Linux':
+        try:
+            with open('/proc/cpuinfo', 'r') as f:
+                for line in f:
+                    if line.startswith('model name'):
+                        return line.split(':', 1)[1].strip()
+        except OSError:
+            pass
+    return platform.processor() or platform.machine()
@@ -15,4 +15,7 @@ COLORS = {
     'WARNING': '\033[33m',  # Yellow
     'ERROR': '\033[31m',    # Red
     'RESET': '\033[0m'      # Reset
-} 
\ No newline at end of file
+}
+
+# Cache directory for persisted indexes (program scan results, etc.)
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cli-bot', 'cache')
\ No newline at end of file
@@ -0,0 +1,166 @@
+from PyQt6.QtWidgets import QCompleter
+from PyQt6.QtCore import Qt, QEvent, QObject, QRunnable, QStringListModel, QThreadPool, QTimer, pyqtSignal
+
+
+def command_words(registry):
+    """Completion words for every registered command; commands taking arguments end with a space"""
+    words = {}
+    for command in registry.commands:
+        # Help-only entries (registry.describe) are forms of a command already listed
+        if command.handler is None and command.entry_point is None:
+            continue
+        words.setdefault(command.name + (' ' if command.takes_args else ''), None)
+    return list(words)
+
+
+def compute_completions(text, registry, program_manager, file_ops, limit=50):
+    """Full command-line candidates for the text typed so far"""
+    lowered = text.lower()
+
+    if lowered.startswith('open workspace '):
+        partial = lowered[15:].strip()
+        names = [name for name in file_ops.workspace_files() if name.lower().startswith(partial)]
+        if not names and partial:
+            names = [name for name in file_ops.workspace_files() if partial in name.lower()]
+        return [text[:15] + name for name in names[:limit]]
+
+    if lowered.startswith('open @'):
+        partial = lowered[6:].strip()
+        names = sorted(program_manager.launch_profiles)
+        return [text[:6] + name for name in names if name.startswith(partial)][:limit]
+
+    if lowered.startswith('open --shell '):
+        return []
+
+    if lowered.startswith('open '):
+        partial = lowered[5:].strip()
+        if not partial:
+            return []
+        candidates = []
+        if 'workspace'.startswith(partial):
+            candidates.append(text[:5] + 'workspace ')
+        matches = program_manager.program_index.snapshot.match(partial, limit)
+        candidates += [text[:5] + name for name in program_manager.frecency.rank(matches)]
+        return candidates[:limit]
+
+    if lowered.startswith('close '):
+        partial = lowered[6:].strip()
+        names = ['all'] + sorted(program_manager.running_processes)
+        return [text[:6] + name for name in names if name.startswith(partial)][:limit]
+
+    if lowered.startswith('logs '):
+        partial = lowered[5:].strip()
+        names = sorted(program_manager.output_capture.buffers)
+        return [text[:5] + name for name in names if name.startswith(partial)][:limit]
+
+    return [word for word in command_words(registry) if word.startswith(lowered) and word != lowered][:limit]
+
+
+class _CompletionTask(QRunnable):
+    """Computes one completion request on the completer's worker thread"""
+
+    def __init__(self, completer, request_id, text):
+        super().__init__()
+        self.completer = completer
+        self.request_id = request_id
+        self.text = text
+
+    def run(self):
+        # A newer keystroke already superseded this request
+        if self.request_id != self.completer.latest_request:
+            return
+        try:
+            candidates = compute_completions(
+                self.text, self.completer.registry, self.completer.program_manager, self.completer.file_ops, self.completer.limit)
+        except Exception:
+            candidates = []
+        if self.request_id == self.completer.latest_request:
+            self.completer.results_ready.emit(self.request_id, candidates)
+
+
+class CommandCompleter(QObject):
+    """Popup completion for the command input.
+
+    Keystrokes are debounced, candidates are computed on a single worker
+    thread, and results for anything but the latest request are dropped,
+    so the GUI thread only ever swaps in a finished list.
+    """
+
+    results_ready = pyqtSignal(int, list)
+
+    def __init__(self, line_edit, registry, program_manager, file_ops, debounce_ms=120, limit=50):
+        super().__init__(line_edit)
+        self.line_edit = line_edit
+        self.registry = registry
+        self.program_manager = program_manager
+        self.file_ops = file_ops
+        self.limit = limit
+        self.latest_request = 0
+
+        self.model = QStringListModel(self)
+        self.completer = QCompleter(self.model, self)
+        self.completer.setWidget(line_edit)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.completer.setMaxVisibleItems(10)
+        self.completer.activated[str].connect(self.insert_completion)
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce_ms)
+        self.debounce_timer.timeout.connect(self.request_completions)
+
+        self.results_ready.connect(self.show_completions)
+        line_edit.textEdited.connect(self.text_edited)
+        self.completer.popup().installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        # QCompleter would both forward Enter to the line edit and complete the current
+        # row; only pick a candidate the user highlighted, otherwise run the typed command
+        if (event.type() == QEvent.Type.KeyPress
+                and event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter)):
+            popup = self.completer.popup()
+            index = popup.currentIndex()
+            popup.hide()
+            if index.isValid() and popup.selectionModel().isSelected(index):
+                self.insert_completion(index.data())
+            else:
+                self.line_edit.returnPressed.emit()
+            return True
+        return super().eventFilter(obj, event)
+
+    def text_edited(self, text):
+        # Invalidate any request still queued or running for older text
+        self.latest_request += 1
+        if text.strip():
+            self.debounce_timer.start()
+        else:
+            self.debounce_timer.stop()
+            self.completer.popup().hide()
+
+    def request_completions(self):
+        self.latest_request += 1
+        self.pool.start(_CompletionTask(self, self.latest_request, self.line_edit.text()))
+
+    def show_completions(self, request_id, candidates):
+        if request_id != self.latest_request:
+            return
+        if not candidates:
+            self.completer.popup().hide()
+            return
+        self.model.setStringList(candidates)
+        self.completer.complete()
+
+    def insert_completion(self, text):
+        self.latest_request += 1
+        self.line_edit.setText(text)
+
+    def shutdown(self):
+        """Drop pending requests and wait for the worker thread to finish"""
+        self.latest_request += 1
+        self.debounce_timer.stop()
+        self.pool.clear()
+        self.pool.waitForDone()
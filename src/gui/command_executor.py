@@ -0,0 +1,156 @@
+import time
+from collections import deque
+from threading import Event, Lock
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+
+# Commands handled on worker threads at the same time
+MAX_CONCURRENT_COMMANDS = 4
+
+
+class CommandFuture:
+    """Handle for one submitted command.
+
+    Filled in by a worker thread (or on the GUI thread for commands that
+    touch widgets); result() blocks until it is done or cancelled.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, number, command, handler, on_gui_thread=False):
+        self.number = number
+        self.command = command
+        self.handler = handler
+        self.on_gui_thread = on_gui_thread
+        self.state = self.PENDING
+        self.response = None
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+        # Cancelled after its handler had started: only the output is dropped, the effects still apply
+        self.cancelled_running = False
+        self._done = Event()
+        self._lock = Lock()
+
+    def done(self):
+        return self.state in (self.DONE, self.CANCELLED)
+
+    def cancelled(self):
+        return self.state == self.CANCELLED
+
+    def result(self, timeout=None):
+        """The handler's response, or None if the command was cancelled"""
+        self._done.wait(timeout)
+        return self.response
+
+    def _cancel(self):
+        with self._lock:
+            if self.done():
+                return False
+            self.cancelled_running = self.state == self.RUNNING
+            self.state = self.CANCELLED
+        self._done.set()
+        return True
+
+    def _run(self):
+        """Run the handler unless the command was cancelled first; False if it was"""
+        with self._lock:
+            if self.state != self.PENDING:
+                return False
+            self.state = self.RUNNING
+        self.started = time.monotonic()
+        try:
+            response = self.handler()
+        except Exception as e:
+            response = f"Error running '{self.command}': {str(e)}"
+        with self._lock:
+            # A cancel that arrived while the handler ran wins; its output is dropped
+            if self.state == self.RUNNING:
+                self.response = response
+                self.state = self.DONE
+        self.finished = time.monotonic()
+        self._done.set()
+        return True
+
+
+class _CommandTask(QRunnable):
+    """Runs one command handler on the executor's thread pool"""
+
+    def __init__(self, executor, future):
+        super().__init__()
+        self.executor = executor
+        self.future = future
+
+    def run(self):
+        if self.future._run():
+            self.executor._completed.emit(self.future)
+
+
+class CommandExecutor(QObject):
+    """Runs command handlers on a bounded QThreadPool, off the GUI thread.
+
+    submit() returns a CommandFuture at once. Handlers run concurrently,
+    up to max_workers at a time, and `finished` is emitted on the GUI
+    thread as soon as each one is done, so a fast command typed after a
+    slow one is answered at once. Keeping responses lined up with their
+    commands is up to the receiver (see ResponseView). Commands that must
+    touch widgets run on the GUI thread on the next event loop pass.
+    """
+
+    finished = pyqtSignal(object)
+    # Emitted from worker threads; queued onto the GUI thread
+    _completed = pyqtSignal(object)
+    # Emitted by submit(); queued, so the caller can track the future before its handler runs
+    _run_on_gui = pyqtSignal(object)
+
+    def __init__(self, parent=None, max_workers=MAX_CONCURRENT_COMMANDS):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self.next_number = 1
+        # Submitted futures not yet delivered, oldest first
+        self.queue = deque()
+        self._completed.connect(self._deliver)
+        self._run_on_gui.connect(self._run_gui_future, Qt.ConnectionType.QueuedConnection)
+
+    def submit(self, command, handler, on_gui_thread=False):
+        """Queue handler() for command and return its future"""
+        future = CommandFuture(self.next_number, command, handler, on_gui_thread)
+        self.next_number += 1
+        self.queue.append(future)
+        if on_gui_thread:
+            self._run_on_gui.emit(future)
+        else:
+            self.pool.start(_CommandTask(self, future))
+        return future
+
+    def cancel(self, number=None):
+        """Cancel one unfinished command by number, or all of them; returns the cancelled futures"""
+        cancelled = []
+        for future in list(self.queue):
+            if (number is None or future.number == number) and future._cancel():
+                cancelled.append(future)
+                self._deliver(future)
+        return cancelled
+
+    def pending(self):
+        """Futures submitted but not yet delivered, oldest first"""
+        return list(self.queue)
+
+    def shutdown(self, timeout_ms=2000):
+        """Cancel everything outstanding and wait briefly for running handlers"""
+        self.cancel()
+        self.pool.clear()
+        self.pool.waitForDone(timeout_ms)
+
+    def _run_gui_future(self, future):
+        if future._run():
+            self._deliver(future)
+
+    def _deliver(self, future):
+        # Each future is delivered once: when done, or when cancelled, whichever comes first
+        if future in self.queue:
+            self.queue.remove(future)
+            self.finished.emit(future)
@@ -1,20 +1,52 @@
 import os
+import html
+import time
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, 
                            QTextEdit, QPushButton, QScrollArea, QWIDGETSIZE_MAX)
-from PyQt6.QtCore import Qt, QSize, QTimer, QPoint
+from PyQt6.QtCore import Qt, QSize, QPoint, pyqtSignal
 from PyQt6.QtGui import QFont, QIcon, QColor
 from qt_material import apply_stylesheet
 from .settings_dialog import SettingsDialog
+from .top_panel import TopPanel
+from .command_completer import CommandCompleter
+from .command_executor import CommandExecutor, MAX_CONCURRENT_COMMANDS
+from .response_view import ResponseView
+from .scrollback import Scrollback, DEFAULT_MAX_BLOCKS
+from src.commands.command_registry import CommandRegistry, GUI, IMMEDIATE
+
+WINDOW_CONTROLS_HELP = """
+
+<b>Window Controls</b>
+    <span style="color: #00ff00;">Normal/Sidebar</span>
+        Toggle between window modes
+    
+    <span style="color: #00ff00;">Pin</span>
+        Toggle always-on-top mode"""
 
 class SidebarWindow(QMainWindow):
+    # Output produced by background work; emitted from any thread, shown on the GUI thread
+    background_output = pyqtSignal(str)
+
     def __init__(self, program_manager, file_ops):
         super().__init__()
         self.program_manager = program_manager
         self.file_ops = file_ops
+        self.background_output.connect(self.show_background_output)
+        self.program_manager.output_callback = self.background_output.emit
         self.setWindowTitle("CLI Bot - by: H4INCE")
         
         # Load settings first
         self.settings = SettingsDialog.load_settings()
+        self.top_panel = None
+        # Runs command handlers off the GUI thread; responses come back as soon as each is ready
+        self.executor = CommandExecutor(self, self.settings.get('max_concurrent_commands', MAX_CONCURRENT_COMMANDS))
+        self.executor.finished.connect(self.show_command_result)
+        self.registry = self.register_commands()
+        self.program_manager.launch_profiles = dict(self.settings.get('launch_profiles', {}))
+        if self.settings.get('python_pool'):
+            self.program_manager.configure_python_pool('on')
+        if self.settings.get('metrics_history'):
+            self.program_manager.system_history('on')
         
         # Set window icon
         icon_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'nh.png')
@@ -160,20 +192,23 @@ class SidebarWindow(QMainWindow):
             }
         """)
         
+        # Complete program, workspace file and command names as the user types
+        self.completer = CommandCompleter(self.command_input, self.registry, self.program_manager, self.file_ops)
+        
         # Add elements to layout
         layout.addWidget(button_bar)
         layout.addWidget(self.output_area)
         layout.addWidget(self.command_input)
         
-        # Initialize loading animation
-        self.loading_timer = QTimer()
-        self.loading_timer.timeout.connect(self.update_loading)
-        self.loading_dots = 0
-        self.loading_text = ""
-        self.loading_color = ""
+        # Bounded output; evicted lines optionally spill to disk and page back in on scroll
+        self.scrollback = Scrollback(self.output_area, self.settings.get('scrollback_lines', DEFAULT_MAX_BLOCKS),
+                                     self.settings.get('scrollback_spill', False), self)
         
-        # Show welcome message with animation
-        self.display_output("Welcome to CLI Bot! Type 'help' for commands.", animate=True)
+        # One handle per command response; spinners only while a handler is running
+        self.responses = ResponseView(self.scrollback, self.format_lines, self)
+        
+        # Show welcome message
+        self.display_output("Welcome to CLI Bot! Type 'help' for commands.")
         
         # Set focus to command input
         self.command_input.setFocus()
@@ -216,142 +251,192 @@ class SidebarWindow(QMainWindow):
             return
             
         # Display user command with custom color
-        self.output_area.append(
-            f'<span style="color: {self.settings.get("user_color", "#00ff00")}">You:</span> {command}'
-        )
+        self.scrollback.append([
+            f'<span style="color: {self.settings.get("user_color", "#00ff00")}">You:</span> {html.escape(command)}'
+        ])
         
-        if command.lower() == 'exit':
-            self.close()
-            return
-            
-        # Process commands
-        if command.lower() == 'help':
-            response = """Available Commands:
-
-<b>System Commands</b>
-    <span style="color: #00ff00;">system info</span>
-        Show detailed system information
-    <span style="color: #00ff00;">clear</span>
-        Clear the output area
-    <span style="color: #00ff00;">exit</span>
-        Close the application
-
-<b>Program Management</b>
-    <span style="color: #00ff00;">open</span> &lt;program/url&gt;
-        Open a program, file, or website
-        Examples: 
-        - open notepad
-        - open chrome
-        - open www.google.com
-        - open C:/path/to/file.exe
-
-    <span style="color: #00ff00;">close</span> &lt;program&gt;
-        Close a specific running program
-    
-    <span style="color: #00ff00;">close all</span>
-        Close all running programs
-    
-    <span style="color: #00ff00;">list programs</span>
-        Show all available programs
-    
-    <span style="color: #00ff00;">running programs</span>
-        Show currently running programs
+        spec, args = self.registry.resolve(command)
+        if spec is None:
+            future = self.executor.submit(command, lambda: "Unknown command. Type 'help' for available commands.")
+            self.responses.track(future)
+        elif spec.run_on == IMMEDIATE:
+            response = spec.handler(args)
+            if response is not None:
+                self.display_output(response, color='#00ffff')
+        else:
+            # Plugins are imported on first use, on the thread that runs them
+            future = self.executor.submit(command, lambda: spec.load(self)(args), on_gui_thread=spec.run_on == GUI)
+            self.responses.track(future)
 
-<b>File Operations</b>
-    <span style="color: #00ff00;">create file</span> &lt;filename&gt; &lt;content&gt;
-        Create a new file in workspace
-        Example: create file test.txt Hello World
-    
-    <span style="color: #00ff00;">list files</span>
-        Show all files in workspace
-    
-    <span style="color: #00ff00;">open workspace</span> &lt;filename&gt;
-        Open a file from workspace
-        Example: open workspace script.py
+    def register_commands(self):
+        """Build the command registry; help text is generated from these entries"""
+        registry = CommandRegistry(self)
+        pm = self.program_manager
+        add = registry.register
 
-<b>Window Controls</b>
-    <span style="color: #00ff00;">Normal/Sidebar</span>
-        Toggle between window modes
-    
-    <span style="color: #00ff00;">Pin</span>
-        Toggle always-on-top mode"""
-            self.display_output(response, animate=False, color='#ffffff')
-        elif command.lower() == 'clear':
-            self.output_area.clear()
-            self.display_output("Output cleared!", animate=True)
+        section = 'System Commands'
+        add('system info', lambda args: pm.get_system_info(), help="Show detailed system information",
+            section=section)
+        # Commands that change self.settings run on the GUI thread, where settings are saved
+        add('system history', self.system_history, usage='[on|off|<window>]', takes_args=True, section=section,
+            help="Record CPU, memory, disk and load, or show min/avg/max over e.g. 30m, 6h, 2d", run_on=GUI)
+        add('help', self.show_help, help="Show this help", section=section, run_on=GUI)
+        add('clear', self.clear_output, help="Clear the output area", section=section, run_on=GUI)
+        add('commands', lambda args: self.list_commands(), help="Show commands still being worked on",
+            section=section, run_on=IMMEDIATE)
+        add('cancel', self.cancel_commands, usage='[number]', takes_args=True, section=section, run_on=IMMEDIATE,
+            help="Cancel one unfinished command, or all of them")
+        add('exit', self.exit_command, help="Close the application", section=section, run_on=IMMEDIATE)
+
+        section = 'Program Management'
+        add('open', pm.open_program, usage='<program/url>', takes_args=True, section=section,
+            help="Open a program, file, or website\n"
+                 "Examples: \n"
+                 "- open notepad\n"
+                 "- open chrome\n"
+                 "- open text editor\n"
+                 "- open www.google.com\n"
+                 "- open C:/path/to/file.exe\n"
+                 "- open vlc --fullscreen movie.mp4\n"
+                 "- open code, firefox, terminal")
+        registry.describe('open', usage='@<profile>', section=section,
+                          help="Open every target of a saved launch profile at once")
+        add('profile save', lambda args: self.manage_profile('save ' + args), takes_args=True, section=section,
+            usage='<name> <target>, <target>, ...', help="Save a launch profile", run_on=GUI)
+        add('profile delete', lambda args: self.manage_profile('delete ' + args), takes_args=True,
+            usage='<name>', help="Delete a launch profile", section=section, run_on=GUI)
+        add('profiles', lambda args: pm.list_profiles(), help="List saved launch profiles", section=section)
+        add('open --shell', lambda args: pm.open_program('--shell ' + args), usage='<command>', takes_args=True,
+            help="Run a command line through the system shell", section=section)
+        add('close', pm.close_program, usage='<program>', takes_args=True,
+            help="Close a specific running program", section=section)
+        add('close all', lambda args: pm.close_program('all'), help="Close all running programs", section=section)
+        add('list programs', lambda args: pm.list_available_programs(), help="Show all available programs",
+            section=section)
+        add('rebuild programs', lambda args: pm.rebuild_programs(),
+            help="Rescan program directories, ignoring the cache", section=section)
+        add('running programs', lambda args: pm.list_running_programs(), help="Show currently running programs",
+            section=section)
+        add('top', lambda args: pm.show_top(), help="Show CPU, memory, threads and IO of launched programs",
+            section=section)
+        add('top live', lambda args: self.show_top_panel(), help="Open a live process monitor panel",
+            section=section, run_on=GUI)
+        add('exited programs', lambda args: pm.list_exited_programs(),
+            help="Show recently exited programs with exit code and resource use", section=section)
+        add('logs', pm.show_logs, usage='<program> [follow|stop]', takes_args=True, section=section,
+            help="Show a program's recent output, or stream it as it arrives")
+        add('python pool', pm.configure_python_pool, usage='[on|off|status]', takes_args=True, section=section,
+            help="Run workspace .py scripts in pre-started warm interpreters")
+
+        section = 'File Operations'
+        add('create file', self.create_file, usage='<filename> <content>', takes_args=True, section=section,
+            help="Create a new file in workspace\nExample: create file test.txt Hello World")
+        add('list files', lambda args: self.file_ops.list_files(), help="Show all files in workspace",
+            section=section)
+        add('open workspace', lambda args: pm.open_program('workspace ' + args), usage='<filename>',
+            takes_args=True, section=section, help="Open a file from workspace\nExample: open workspace script.py")
+        add('jobs', lambda args: pm.list_jobs(), help="Show background builds", section=section)
+        add('jobs cancel', pm.cancel_job, usage='<number>', takes_args=True, help="Stop a background build",
+            section=section)
+        add('build cache stats', lambda args: pm.build_cache_stats(),
+            help="Show cached builds of compiled workspace files", section=section)
+        add('build cache clear', lambda args: pm.clear_build_cache(), help="Remove all cached builds",
+            section=section)
+
+        registry.load_plugins()
+        return registry
+
+    def exit_command(self, args):
+        self.close()
+
+    def show_help(self, args):
+        self.display_output(self.registry.help_html() + WINDOW_CONTROLS_HELP, color='#ffffff', rich=True)
+
+    def clear_output(self, args):
+        self.scrollback.clear()
+        self.responses.forget_lines()
+        self.display_output("Output cleared!")
+
+    def create_file(self, args):
+        parts = args.split(maxsplit=1)
+        if len(parts) < 2:
+            return "Usage: create file <filename> <content>"
+        filename, content = parts
+        return self.file_ops.create_file(filename, content)
+
+    def system_history(self, args):
+        response = self.program_manager.system_history(args)
+        if args.strip().lower() in ('on', 'off'):
+            self.settings['metrics_history'] = self.program_manager.metrics_recorder is not None
+            SettingsDialog.save_to_file(self.settings)
+        return response
+
+    def manage_profile(self, args):
+        response = self.program_manager.manage_profile(args)
+        # A copy, so later profile changes cannot alter settings while they are being saved
+        self.settings['launch_profiles'] = {name: list(targets)
+                                            for name, targets in self.program_manager.launch_profiles.items()}
+        SettingsDialog.save_to_file(self.settings)
+        return response
+
+    def show_command_result(self, future):
+        """Show a finished command's response in the line reserved for it"""
+        if future.cancelled():
+            self.responses.finish(future, self._cancelled_text(future), '#ffaa00')
         else:
-            # Handle other commands
-            if command.lower().startswith('open '):
-                response = self.program_manager.open_program(command[5:])
-            elif command.lower().startswith('close '):
-                response = self.program_manager.close_program(command[6:])
-            elif command.lower() == 'list programs':
-                response = self.program_manager.list_available_programs()
-            elif command.lower() == 'running programs':
-                response = self.program_manager.list_running_programs()
-            elif command.lower() == 'system info':
-                response = self.program_manager.get_system_info()
-            elif command.lower().startswith('create file'):
-                parts = command.split(maxsplit=3)
-                if len(parts) < 4:
-                    response = "Usage: create file <filename> <content>"
-                else:
-                    _, _, filename, content = parts
-                    response = self.file_ops.create_file(filename, content)
-            elif command.lower() == 'list files':
-                response = self.file_ops.list_files()
-            else:
-                response = f"Unknown command. Type 'help' for available commands."
-            
-            self.display_output(response, animate=True, color='#00ffff')
-        
-    def display_output(self, text, animate=True, color='#ffffff'):
-        if not animate:
-            formatted_text = text.replace('\n', '<br>')
-            self.output_area.append(
-                f'<span style="color: {self.settings.get("bot_color", "#ff00ff")}">'
-                f'{self.settings.get("bot_prefix", "Bot:")}</span> '
-                f'<span style="color: {color};">{formatted_text}</span>'
-            )
-            return
-        
-        # Start loading animation
-        self.loading_text = text
-        self.loading_color = color
-        self.loading_dots = 0
-        self.output_area.append(
-            f'<span style="color: {self.settings.get("bot_color", "#ff00ff")}">'
-            f'{self.settings.get("bot_prefix", "Bot:")}</span> '
-            f'<span style="color: {color};">Loading</span>'
-        )
-        self.loading_timer.start(500)  # Update every 500ms
-
-    def update_loading(self):
-        self.loading_dots = (self.loading_dots + 1) % 4
-        dots = "." * self.loading_dots
-        
-        # Update the last line
-        cursor = self.output_area.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        cursor.movePosition(cursor.MoveOperation.StartOfLine, cursor.MoveMode.KeepAnchor)
-        cursor.removeSelectedText()
+            self.responses.finish(future, future.response, '#00ffff')
+
+    def list_commands(self):
+        """Commands submitted but not yet answered, oldest first"""
+        pending = self.executor.pending()
+        if not pending:
+            return "No commands running"
+        now = time.monotonic()
+        response = "Commands in progress:\n"
+        for future in pending:
+            since = future.started or future.submitted
+            response += f"- #{future.number} {future.command}: {future.state} for {now - since:.1f}s\n"
+        return response
+
+    def cancel_commands(self, args):
+        """Cancel one command by number (see 'commands'), or all unanswered ones"""
+        args = args.strip().lstrip('#')
+        if args and not args.isdigit():
+            return "Usage: cancel [number]"
+        cancelled = self.executor.cancel(int(args) if args else None)
+        if not cancelled:
+            return f"No unfinished command #{args}" if args else "No commands to cancel"
+        return "Cancelled " + ", ".join(
+            f"#{future.number} {future.command}" + (" (already running; its effects still apply)"
+                                                    if future.cancelled_running else "")
+            for future in cancelled)
+
+    def _cancelled_text(self, future):
+        if future.cancelled_running:
+            return (f"Cancelled '{future.command}'; the handler had already started and its effects "
+                    f"still apply, only its output is dropped")
+        return f"Cancelled '{future.command}' before it started"
         
-        if self.loading_dots == 0:  # Animation complete
-            self.loading_timer.stop()
-            # Show final text
-            formatted_text = self.loading_text.replace('\n', '<br>')
-            cursor.insertHtml(
-                f'<span style="color: {self.settings.get("bot_color", "#ff00ff")}">'
-                f'{self.settings.get("bot_prefix", "Bot:")}</span> '
-                f'<span style="color: {self.loading_color};">{formatted_text}</span>'
-            )
+    def display_output(self, text, color='#ffffff', rich=False):
+        self.scrollback.append(self.format_lines(text, color, rich))
+
+    def format_lines(self, text, color, rich=False):
+        """HTML for a bot response, one entry per output line: the configured prefix, then text in color.
+
+        Responses are plain text (program output, usage strings with <args>) and are
+        escaped with their spacing kept; only rich text, such as help, is inserted as HTML.
+        """
+        if rich:
+            lines = [f'<span style="color: {color};">{line}</span>' for line in text.split('\n')]
         else:
-            # Show loading animation
-            cursor.insertHtml(
-                f'<span style="color: {self.settings.get("bot_color", "#ff00ff")}">'
-                f'{self.settings.get("bot_prefix", "Bot:")}</span> '
-                f'<span style="color: {self.loading_color};">Loading{dots}</span>'
-            )
+            lines = [f'<span style="color: {color}; white-space: pre-wrap;">{html.escape(line, quote=False)}</span>'
+                     for line in text.split('\n')]
+        lines[0] = (f'<span style="color: {self.settings.get("bot_color", "#ff00ff")}">'
+                    f'{self.settings.get("bot_prefix", "Bot:")}</span> ' + lines[0])
+        return lines
+
+    def show_background_output(self, text):
+        self.display_output(text, color='#00ffff')
 
     def toggle_always_on_top(self):
         self.always_on_top = not self.always_on_top
@@ -402,6 +487,24 @@ class SidebarWindow(QMainWindow):
         # Set focus to command input after window is shown
         self.command_input.setFocus()
 
+    def closeEvent(self, event):
+        """Stop background completion and command work before the window goes away"""
+        self.completer.shutdown()
+        self.executor.shutdown()
+        if self.program_manager.python_pool is not None:
+            self.program_manager.python_pool.shutdown()
+        if self.program_manager.metrics_recorder is not None:
+            self.program_manager.metrics_recorder.stop()
+        super().closeEvent(event)
+
+    def show_top_panel(self):
+        """Open (or raise) the live process monitor window"""
+        if self.top_panel is None:
+            self.top_panel = TopPanel(self.program_manager.process_monitor, self)
+        self.top_panel.show()
+        self.top_panel.raise_()
+        return "Opened the live process monitor"
+
     def showEvent(self, event):
         """Handle show event to ensure input focus"""
         super().showEvent(event)
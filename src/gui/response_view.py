@@ -0,0 +1,113 @@
+import time
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtGui import QTextCursor
+
+# A command that is still running after this many seconds gets a spinner line
+SPINNER_DELAY = 0.3
+# Milliseconds between spinner frames
+SPINNER_INTERVAL = 120
+SPINNER_FRAMES = '|/-\\'
+
+
+class ResponseHandle:
+    """The output line one command's response goes to.
+
+    The line is reserved, right below the command, as soon as the command
+    is submitted; the cursor marks it, and Qt keeps it pointing at the
+    right place as other text is added around it.
+    """
+
+    def __init__(self, future):
+        self.future = future
+        # On the spinner line, whose block user state is the command number
+        self.cursor = None
+        self.frame = 0
+
+    def line_alive(self):
+        """Whether the spinner line is still in the document; scrollback eviction may have removed it"""
+        return self.cursor is not None and self.cursor.block().userState() == self.future.number
+
+    def remove_line(self):
+        """Delete this handle's line, including the line break before it"""
+        cursor = self.cursor
+        cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock)
+        if cursor.block().previous().isValid():
+            cursor.movePosition(QTextCursor.MoveOperation.PreviousCharacter)
+            cursor.movePosition(QTextCursor.MoveOperation.NextBlock, QTextCursor.MoveMode.KeepAnchor)
+        cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+
+
+class ResponseView(QObject):
+    """Places command responses in the output area as soon as they are ready.
+
+    Each submitted command gets its own ResponseHandle, so responses never
+    share state. A command reserves its line when it is submitted, and its
+    response fills that line the moment its own handler returns, however
+    long earlier commands take. A single timer animates spinners, and only
+    for commands whose handler has been running for SPINNER_DELAY.
+    """
+
+    def __init__(self, scrollback, format_lines, parent=None):
+        super().__init__(parent)
+        self.scrollback = scrollback
+        # format_lines(text, color) -> the HTML lines of one bot response
+        self.format_lines = format_lines
+        self.handles = {}
+        self.timer = QTimer(self)
+        self.timer.setInterval(SPINNER_INTERVAL)
+        self.timer.timeout.connect(self.tick)
+
+    def track(self, future):
+        """Start tracking a submitted command and reserve its line; nothing to track if it already finished"""
+        if future.done():
+            return None
+        handle = ResponseHandle(future)
+        self._show(handle, time.monotonic())
+        self.handles[future.number] = handle
+        if not self.timer.isActive():
+            self.timer.start()
+        return handle
+
+    def finish(self, future, text, color):
+        """Show a command's response (None if it showed its own output) and drop its handle"""
+        handle = self.handles.pop(future.number, None)
+        if not self.handles:
+            self.timer.stop()
+        if handle is not None and handle.line_alive():
+            # Unmark the line, it holds ordinary output from now on
+            handle.cursor.block().setUserState(-1)
+            if text is None:
+                handle.remove_line()
+            else:
+                self.scrollback.replace_block(handle.cursor, self.format_lines(text, color))
+        elif text is not None:
+            self.scrollback.append(self.format_lines(text, color))
+
+    def forget_lines(self):
+        """The output area was cleared; lines of commands still running are added again on the next tick"""
+        for handle in self.handles.values():
+            handle.cursor = None
+
+    def tick(self):
+        now = time.monotonic()
+        for handle in self.handles.values():
+            future = handle.future
+            if future.state != future.RUNNING or now - future.started < SPINNER_DELAY:
+                continue
+            handle.frame = (handle.frame + 1) % len(SPINNER_FRAMES)
+            self._show(handle, now)
+
+    def _show(self, handle, now):
+        """Draw a handle's spinner (or waiting) line, reserving the line if it has none"""
+        future = handle.future
+        text = f"{SPINNER_FRAMES[handle.frame]} {future.command}"
+        if future.state == future.RUNNING and future.started is not None:
+            text += f" ({now - future.started:.1f}s)"
+        lines = self.format_lines(text, '#888888')
+        if not handle.line_alive():
+            handle.cursor = self.scrollback.append_now(lines)
+            # Tags the line, so a cursor left on another block after eviction is noticed
+            handle.cursor.block().setUserState(future.number)
+        else:
+            self.scrollback.replace_block(handle.cursor, lines)
@@ -0,0 +1,176 @@
+import tempfile
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtGui import QTextCursor, QTextDocumentFragment
+
+# Output lines (text blocks) kept in the output area
+DEFAULT_MAX_BLOCKS = 5000
+
+
+class Scrollback(QObject):
+    """Bounded, batched output for a QTextEdit.
+
+    Lines are queued and inserted together on the next event loop pass,
+    inside one edit block, so a burst of output costs one layout instead
+    of one per line. Once the document holds more than max_blocks lines
+    the oldest are evicted, a tenth of the cap at a time. With spill on,
+    evicted lines are written to an anonymous temporary file and paged
+    back in when the user scrolls to the top; otherwise they are dropped.
+    While the user is scrolled up reading, eviction waits until the
+    document reaches twice the cap, so the view does not jump.
+    """
+
+    def __init__(self, output_area, max_blocks=DEFAULT_MAX_BLOCKS, spill=False, parent=None):
+        super().__init__(parent)
+        self.output_area = output_area
+        self.document = output_area.document()
+        self.max_blocks = max(max_blocks, 10)
+        self.spill = spill
+        self.evicted = 0
+        self._pending = []
+        # (offset, length, blocks) of each spilled chunk, oldest first
+        self._chunks = []
+        self._file = None
+        self._paging = False
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self.flush)
+        self.scrollbar = output_area.verticalScrollBar()
+        self.scrollbar.valueChanged.connect(self._scrolled)
+
+    def append(self, lines):
+        """Queue HTML lines, each to become one block, for the next batch"""
+        self._pending.extend(lines)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def append_now(self, lines):
+        """Insert HTML lines at once, after anything queued; returns a cursor on the first new line"""
+        self._pending.extend(lines)
+        self.flush()
+        return QTextCursor(self.document.findBlockByNumber(max(0, self.document.blockCount() - len(lines))))
+
+    def flush(self):
+        """Insert every queued line in one edit block, then evict the oldest lines if over the cap"""
+        self._flush_timer.stop()
+        if not self._pending:
+            return
+        lines, self._pending = self._pending, []
+        at_bottom = self._at_bottom()
+
+        # Lines that would be evicted straight away skip the document altogether
+        overflow = len(lines) - self.max_blocks
+        if overflow > 0:
+            self._drop(self.document.blockCount() if not self.document.isEmpty() else 0)
+            for start in range(0, overflow, self._chunk_size()):
+                chunk = lines[start:min(start + self._chunk_size(), overflow)]
+                if self.spill:
+                    self._spill(''.join(f'<p style="margin-top:0px; margin-bottom:0px;">{line}</p>'
+                                        for line in chunk), len(chunk))
+                self.evicted += len(chunk)
+            lines = lines[overflow:]
+
+        cursor = QTextCursor(self.document)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for line in lines:
+            if not self.document.isEmpty():
+                cursor.insertBlock()
+            cursor.insertHtml(line)
+        cursor.endEditBlock()
+        self._trim(at_bottom)
+
+    def replace_block(self, cursor, lines):
+        """Overwrite the block under cursor with HTML lines, one block each"""
+        at_bottom = self._at_bottom()
+        cursor.beginEditBlock()
+        cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock)
+        cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+        cursor.insertHtml(lines[0])
+        for line in lines[1:]:
+            cursor.insertBlock()
+            cursor.insertHtml(line)
+        cursor.endEditBlock()
+        self._trim(at_bottom)
+
+    def clear(self):
+        """Empty the output area and forget spilled history"""
+        self._pending = []
+        self._flush_timer.stop()
+        # Forget the spill first: clearing scrolls to the top, which would page it back in
+        self._chunks = []
+        self.evicted = 0
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.output_area.clear()
+
+    def page_in(self):
+        """Put the most recently spilled chunk back at the top; False if there is none"""
+        if not self._chunks:
+            return False
+        offset, length, blocks = self._chunks.pop()
+        self._file.seek(offset)
+        fragment = QTextDocumentFragment.fromHtml(self._file.read(length).decode('utf-8'))
+        # Chunks are only ever read from the end, so the file can shrink with them
+        self._file.truncate(offset)
+
+        # Marks the line that was on top; Qt moves it down as the chunk goes in above it
+        anchor = QTextCursor(self.document)
+        cursor = QTextCursor(self.document)
+        cursor.beginEditBlock()
+        cursor.insertBlock()
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        cursor.insertFragment(fragment)
+        cursor.endEditBlock()
+        self.evicted -= blocks
+        # Keep the lines the user was looking at in view
+        self._paging = True
+        self.output_area.setTextCursor(anchor)
+        self.output_area.ensureCursorVisible()
+        self._paging = False
+        return True
+
+    def _at_bottom(self):
+        return self.scrollbar.value() >= self.scrollbar.maximum() - 4
+
+    def _chunk_size(self):
+        # Eviction and paging granularity
+        return max(self.max_blocks // 10, 1)
+
+    def _trim(self, at_bottom):
+        limit = self.max_blocks if at_bottom else self.max_blocks * 2
+        if self.document.blockCount() > limit:
+            self._drop(self.document.blockCount() - self.max_blocks + self._chunk_size())
+        if at_bottom:
+            self.scrollbar.setValue(self.scrollbar.maximum())
+
+    def _drop(self, count):
+        """Evict the oldest count blocks, spilling them a chunk at a time"""
+        while count > 0:
+            size = min(count, self._chunk_size(), self.document.blockCount())
+            cursor = QTextCursor(self.document)
+            # Select to the end of the last evicted block, so the chunk carries no trailing line break
+            cursor.movePosition(QTextCursor.MoveOperation.NextBlock, QTextCursor.MoveMode.KeepAnchor, size - 1)
+            cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+            if self.spill:
+                self._spill(cursor.selection().toHtml(), size)
+            # ...then take the line break too, unless this empties the document
+            cursor.movePosition(QTextCursor.MoveOperation.NextCharacter, QTextCursor.MoveMode.KeepAnchor)
+            cursor.removeSelectedText()
+            self.evicted += size
+            count -= size
+
+    def _spill(self, html, blocks):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix='cli-bot-scrollback-')
+        data = html.encode('utf-8')
+        self._file.seek(0, 2)
+        offset = self._file.tell()
+        self._file.write(data)
+        self._chunks.append((offset, len(data), blocks))
+
+    def _scrolled(self, value):
+        if not self._paging and value == self.scrollbar.minimum() and self._chunks:
+            self.page_in()
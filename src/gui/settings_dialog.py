@@ -310,12 +310,14 @@ class SettingsDialog(QDialog):
                 """)
 
     def save_settings(self):
-        settings = {
+        # Keep settings this dialog does not edit (e.g. python_pool)
+        settings = dict(self.settings)
+        settings.update({
             'bot_prefix': self.prefix_input.text(),
             'bot_color': self.bot_color.name(),
             'user_color': self.user_color.name(),
             'theme': self.theme_combo.currentText()
-        }
+        })
         
         self.save_to_file(settings)
         if self.parent:
@@ -0,0 +1,92 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
+from PyQt6.QtCore import Qt, pyqtSignal
+from src.utils.display import format_bytes
+
+COLUMNS = ['Program', 'PID', 'Procs', 'CPU %', 'RSS', 'Threads', 'Read/s', 'Write/s', 'CPU history']
+
+
+class TopPanel(QWidget):
+    """Live table of launched programs' resource use, fed by a ProcessMonitor.
+
+    The monitor's sampling thread emits each tick's rows through a queued
+    signal; the GUI thread then renders only the difference from the
+    previous tick, touching the cells whose text changed.
+    """
+
+    rows_ready = pyqtSignal(object)
+
+    def __init__(self, monitor, parent=None):
+        super().__init__(parent, Qt.WindowType.Window)
+        self.monitor = monitor
+        self.setWindowTitle("CLI Bot - Top")
+        self.resize(720, 260)
+
+        layout = QVBoxLayout(self)
+        self.status = QLabel("Waiting for the first sample...")
+        layout.addWidget(self.status)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        # Row text per program name, as last rendered
+        self._rendered = {}
+        self.rows_ready.connect(self.render_rows)
+        # One callable, so the monitor can recognize it again on unsubscribe
+        self._emit_rows = self.rows_ready.emit
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.monitor.subscribe(self._emit_rows)
+        self.render_rows(self.monitor.rows)
+
+    def closeEvent(self, event):
+        self.monitor.unsubscribe(self._emit_rows)
+        super().closeEvent(event)
+
+    def render_rows(self, rows):
+        """Apply one tick: drop exited programs, add new ones and update changed cells"""
+        texts = {row[0]: _row_text(row) for row in rows}
+
+        for name in [name for name in self._rendered if name not in texts]:
+            self.table.removeRow(self._row_of(name))
+            del self._rendered[name]
+
+        for name, text in texts.items():
+            old = self._rendered.get(name)
+            if old is None:
+                position = self.table.rowCount()
+                self.table.insertRow(position)
+                for column, value in enumerate(text):
+                    item = QTableWidgetItem(value)
+                    if column > 0 and column < len(text) - 1:
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                    self.table.setItem(position, column, item)
+            elif old != text:
+                position = self._row_of(name)
+                for column, (before, after) in enumerate(zip(old, text)):
+                    if before != after:
+                        self.table.item(position, column).setText(after)
+            self._rendered[name] = text
+
+        self.status.setText(f"{len(rows)} programs, sampled every {self.monitor.interval:g}s")
+
+    def _row_of(self, name):
+        for position in range(self.table.rowCount()):
+            if self.table.item(position, 0).text() == name:
+                return position
+        return -1
+
+
+def _row_text(row):
+    name, pid, processes, cpu, rss, threads, read_rate, write_rate, history = row
+    return (
+        name, str(pid), str(processes), f"{cpu:.1f}", format_bytes(rss), str(threads),
+        format_bytes(read_rate) if read_rate is not None else "n/a",
+        format_bytes(write_rate) if write_rate is not None else "n/a",
+        history,
+    )
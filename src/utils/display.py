@@ -19,6 +19,14 @@ def display_ascii_art():
 def get_user_input():
     return input(Fore.GREEN + "You: " + Style.RESET_ALL)
 
+def format_bytes(size):
+    """Format a byte count (or rate) to human readable format, e.g. 1.5MB"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
+
 def display_bot_response(response):
     print(Fore.BLUE + "Bot: " + Style.RESET_ALL + response)
     print() 
\ No newline at end of file